@@ -1,49 +1,64 @@
 """데이터 관리 모듈"""
 from datetime import datetime
-from typing import Dict, Optional, List, Any
-from functools import lru_cache
+from typing import Dict, Optional, List, Any, Callable, Awaitable, Coroutine, Set, FrozenSet
 import asyncio
+import time
+from sortedcontainers import SortedSet
 
 from src.core.base_handler import BaseHandler
 from src.models.stock_info import StockInfo
-from config.settings import STOCK_INFO_CACHE_SIZE, STOCK_INFO_DIR, ls_config
+from src.models.vi_record import VIRecord
+from src.utils.time_utils import hhmmss_now
+from config.settings import STOCK_INFO_DIR, ls_config
 
 class DataManager(BaseHandler):
     """데이터 관리 클래스"""
     def __init__(self):
         super().__init__('DataManager')
         self.stock_info: Dict[str, StockInfo] = {}
+        self.known_codes: FrozenSet[str] = frozenset()  # 로드된 종목코드 (존재 여부 확인용)
         self.vi_active_stocks: Dict[str, datetime] = {}
-        self.unsubscribed_stocks: Dict[str, Dict[str, Any]] = {}
-        self._vi_timers: Dict[str, asyncio.Task] = {}  # VI 타이머 태스크 저장
+        self.unsubscribed_stocks: Dict[str, VIRecord] = {}
+        self._active_sorted: SortedSet = SortedSet()  # 로그 출력용 정렬된 VI 종목
+        # VI 구독 만료 시각 (monotonic, 만료 시간이 동일하므로 삽입 순서 = 만료 순서)
+        self._vi_deadlines: Dict[str, float] = {}
+        self._vi_callbacks: Dict[str, Callable[[str], Awaitable[None]]] = {}
+        self._vi_expiry_task: Optional[asyncio.Task] = None
+        self._vi_wakeup = asyncio.Event()
+        self._task_group: Optional[asyncio.TaskGroup] = None  # 메인 루프가 설정하는 태스크 그룹
+        self._tasks: Set[asyncio.Task] = set()  # 태스크 그룹이 없을 때 참조 유지용
+    
+    def set_stock_info(self, stock_info: Dict[str, StockInfo]) -> None:
+        """종목 정보 설정"""
+        self.stock_info = stock_info
+        self.known_codes = frozenset(stock_info)
+    
+    def is_known_code(self, stock_code: str) -> bool:
+        """로드된 종목인지 확인"""
+        return stock_code in self.known_codes
     
-    @lru_cache(maxsize=STOCK_INFO_CACHE_SIZE)
     def get_stock_info(self, stock_code: str) -> Optional[StockInfo]:
-        """종목 정보 조회 (캐시 적용)"""
+        """종목 정보 조회"""
         return self.stock_info.get(stock_code)
     
     def add_vi_stock(self, stock_code: str) -> None:
         """VI 발동 종목 추가"""
         current_time = datetime.now(self.kst)
         self.vi_active_stocks[stock_code] = current_time
-        self.log(f"VI 발동 종목 추가: {stock_code} (발동시각: {current_time.strftime('%H:%M:%S')})")
+        self._active_sorted.add(stock_code)
+        self.log(f"VI 발동 종목 추가: {stock_code} (발동시각: {hhmmss_now(self.kst)})")
     
     def remove_vi_stock(self, stock_code: str) -> None:
         """VI 발동 종목 제거"""
         if stock_code in self.vi_active_stocks:
             activation_time = self.vi_active_stocks.pop(stock_code)
-            deactivation_time = datetime.now(self.kst)
-            self.unsubscribed_stocks[stock_code] = {
-                'activation_time': activation_time,
-                'deactivation_time': deactivation_time,
-                'status': '해지완료'
-            }
-            self.log(f"VI 발동 종목 제거: {stock_code} (해제시각: {deactivation_time.strftime('%H:%M:%S')})")
+            self._active_sorted.discard(stock_code)
+            self.unsubscribed_stocks[stock_code] = VIRecord(activation_time, datetime.now(self.kst))
+            self.log(f"VI 발동 종목 제거: {stock_code} (해제시각: {hhmmss_now(self.kst)})")
             
             # 타이머 취소
-            if stock_code in self._vi_timers:
-                self._vi_timers[stock_code].cancel()
-                del self._vi_timers[stock_code]
+            self._vi_deadlines.pop(stock_code, None)
+            self._vi_callbacks.pop(stock_code, None)
     
     def is_vi_active(self, stock_code: str) -> bool:
         """VI 발동 상태 확인"""
@@ -53,25 +68,72 @@ class DataManager(BaseHandler):
         """현재 활성화된 VI 종목 목록 반환"""
         return list(self.vi_active_stocks.keys())
     
-    async def start_vi_timer(self, stock_code: str, callback) -> None:
+    def get_sorted_active_stocks(self) -> SortedSet:
+        """현재 활성화된 VI 종목을 정렬된 상태로 반환 (복사 없음)"""
+        return self._active_sorted
+    
+    def set_task_group(self, task_group: Optional[asyncio.TaskGroup]) -> None:
+        """백그라운드 태스크를 관리할 태스크 그룹 설정"""
+        self._task_group = task_group
+    
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+        """백그라운드 태스크 생성 (태스크 그룹 또는 참조 집합으로 관리)"""
+        if self._task_group is not None:
+            return self._task_group.create_task(coro)
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+    
+    async def start_vi_timer(self, stock_code: str, callback: Callable[[str], Awaitable[None]]) -> None:
         """VI 타이머 시작"""
-        if stock_code in self._vi_timers:
-            self._vi_timers[stock_code].cancel()
+        # 재시작 시 맨 뒤로 이동하여 만료 순서 유지
+        self._vi_deadlines.pop(stock_code, None)
+        self._vi_deadlines[stock_code] = time.monotonic() + ls_config.VI.SUBSCRIPTION_TIMEOUT
+        self._vi_callbacks[stock_code] = callback
         
-        # 3분 타이머 시작
-        timer = asyncio.create_task(self._vi_timer(stock_code, callback))
-        self._vi_timers[stock_code] = timer
+        if self._vi_expiry_task is None:
+            self._vi_expiry_task = self._spawn(self._run_vi_expiry())
+        self._vi_wakeup.set()
     
-    async def _vi_timer(self, stock_code: str, callback) -> None:
-        """VI 타이머 실행"""
+    async def _run_vi_expiry(self) -> None:
+        """VI 타이머 실행 (모든 종목의 만료를 하나의 태스크에서 처리)"""
         try:
-            await asyncio.sleep(ls_config.VI.SUBSCRIPTION_TIMEOUT)  # 3분 대기
-            if stock_code in self.vi_active_stocks:
-                await callback(stock_code)
+            while self._vi_deadlines:
+                self._vi_wakeup.clear()
+                
+                # 만료된 종목을 앞에서부터 처리
+                now = time.monotonic()
+                while self._vi_deadlines:
+                    stock_code, deadline = next(iter(self._vi_deadlines.items()))
+                    if deadline > now:
+                        break
+                    del self._vi_deadlines[stock_code]
+                    callback = self._vi_callbacks.pop(stock_code, None)
+                    if callback and stock_code in self.vi_active_stocks:
+                        try:
+                            await callback(stock_code)
+                        except Exception as e:
+                            self.log(f"VI 타이머 실행 중 오류 발생: {e}", 'error')
+                
+                if not self._vi_deadlines:
+                    break
+                
+                # 다음 만료 시각까지 대기 (새 타이머 등록 시 깨어남)
+                timeout = next(iter(self._vi_deadlines.values())) - time.monotonic()
+                try:
+                    await asyncio.wait_for(self._vi_wakeup.wait(), timeout=max(0, timeout))
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
             pass
-        except Exception as e:
-            self.log(f"VI 타이머 실행 중 오류 발생: {e}", 'error')
         finally:
-            if stock_code in self._vi_timers:
-                del self._vi_timers[stock_code] 
\ No newline at end of file
+            self._vi_expiry_task = None
+    
+    def cleanup(self) -> None:
+        """정리 작업"""
+        if self._vi_expiry_task:
+            self._vi_expiry_task.cancel()
+            self._vi_expiry_task = None
+        self._vi_deadlines.clear()
+        self._vi_callbacks.clear()
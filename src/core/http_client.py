@@ -0,0 +1,32 @@
+"""HTTP 세션 관리 모듈"""
+from typing import Any, Optional
+import aiohttp
+import orjson
+
+def _json_dumps(obj: Any) -> str:
+    """요청 본문 JSON 직렬화 (aiohttp는 str 반환을 기대)"""
+    return orjson.dumps(obj).decode()
+
+class HttpClient:
+    """애플리케이션 전체에서 공유하는 HTTP 세션 관리 클래스"""
+    
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        공유 세션 반환 (최초 호출 시 생성)
+        
+        Returns:
+            커넥션 풀을 재사용하는 ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(connector=connector, json_serialize=_json_dumps)
+        return self._session
+        
+    async def close(self) -> None:
+        """공유 세션 종료"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
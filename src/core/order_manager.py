@@ -1,23 +1,34 @@
 """주문 관리 모듈"""
 from typing import Dict, Optional
-import aiohttp
+from src.core.http_client import HttpClient
 from config.settings import LSConfig as config
 
 class OrderManager:
     """주문 관리 클래스"""
     
-    def __init__(self, token_manager):
+    def __init__(self, token_manager, http_client: Optional[HttpClient] = None):
         """
         OrderManager 초기화
         
         Args:
             token_manager: 토큰 관리자 인스턴스
+            http_client: 공유 HTTP 클라이언트 (미지정 시 토큰 관리자의 클라이언트 사용)
         """
         self.token_manager = token_manager
+        self.http_client = http_client or token_manager.http_client
         self.base_url = f"{config.API_URL}/stock/order"
-        self.headers = {
+        
+    async def _auth_headers(self) -> Dict[str, str]:
+        """
+        요청 헤더 생성
+        
+        Returns:
+            유효한 토큰이 담긴 요청 헤더
+        """
+        token = await self.token_manager.get_access_token()
+        return {
             "Content-Type": "application/json",
-            "authorization": f"Bearer {self.token_manager.get_access_token()}"
+            "authorization": f"Bearer {token}"
         }
         
     async def place_order(
@@ -56,9 +67,10 @@ class OrderManager:
             "side": side
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=self.headers, json=data) as response:
-                return await response.json()
+        headers = await self._auth_headers()
+        session = await self.http_client.get_session()
+        async with session.post(url, headers=headers, json=data) as response:
+            return await response.json()
                 
     async def modify_order(
         self,
@@ -90,9 +102,10 @@ class OrderManager:
         if price is not None:
             data["price"] = price
             
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=self.headers, json=data) as response:
-                return await response.json()
+        headers = await self._auth_headers()
+        session = await self.http_client.get_session()
+        async with session.post(url, headers=headers, json=data) as response:
+            return await response.json()
                 
     async def cancel_order(
         self,
@@ -115,9 +128,10 @@ class OrderManager:
             "order_no": order_no
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=self.headers, json=data) as response:
-                return await response.json()
+        headers = await self._auth_headers()
+        session = await self.http_client.get_session()
+        async with session.post(url, headers=headers, json=data) as response:
+            return await response.json()
                 
     async def get_order_status(
         self,
@@ -140,6 +154,7 @@ class OrderManager:
             "order_no": order_no
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers, params=params) as response:
-                return await response.json() 
\ No newline at end of file
+        headers = await self._auth_headers()
+        session = await self.http_client.get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            return await response.json() 
\ No newline at end of file
@@ -1,42 +1,91 @@
 """토큰 관리 모듈"""
 import os
 import json
+import asyncio
+import time
 from datetime import datetime, timedelta
-import aiohttp
-from dotenv import set_key
+from typing import Optional, Callable, List
 
 from src.core.base_handler import BaseHandler
+from src.core.http_client import HttpClient
 from config.settings import ls_config
 
 class TokenManager(BaseHandler):
     """토큰 관리 클래스"""
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, http_client: Optional[HttpClient] = None):
         super().__init__('TokenManager')
         self.api_key = api_key
         self.api_secret = api_secret
+        self.http_client = http_client or HttpClient()
         self.token_url = f"{ls_config.API.API_URL}/oauth2/token"
         self.token = None
         self.token_expires_at = None
+        self._lock = asyncio.Lock()  # 동시 토큰 발급 요청 방지
+        self._persist_tasks = set()  # 진행 중인 .env 기록 태스크 (참조 유지)
+        self._refresh_deadline = 0.0  # 갱신이 필요해지는 시점 (monotonic, 갱신 여유시간 반영)
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._token_listeners: List[Callable[[str], None]] = []  # 토큰 갱신 시 호출할 콜백
+    
+    def _set_refresh_deadline(self, expires_at: datetime) -> None:
+        """만료 시각을 monotonic 기준 갱신 시점으로 변환"""
+        remaining = (expires_at - datetime.now(self.kst)).total_seconds()
+        self._refresh_deadline = time.monotonic() + remaining - ls_config.Timer.TOKEN_REFRESH_MARGIN
     
     def save_token_to_env(self, token: str, expires_in: int, env_file: str = '.env') -> None:
         """토큰 정보를 .env 파일에 저장"""
         current_time = datetime.now(self.kst)
         expires_at = current_time + timedelta(seconds=expires_in)
         
-        # 토큰 정보를 .env 파일에 저장
-        set_key(env_file, 'LS_ACCESS_TOKEN', token)
-        set_key(env_file, 'LS_TOKEN_EXPIRES_AT', expires_at.isoformat())
-        
-        # 환경 변수 로드
-        from dotenv import load_dotenv
-        load_dotenv(env_file)
-        
+        # 메모리 값을 기준으로 사용하고 환경 변수도 함께 갱신
         self.token = token
         self.token_expires_at = expires_at
+        self._set_refresh_deadline(expires_at)
+        os.environ['LS_ACCESS_TOKEN'] = token
+        os.environ['LS_TOKEN_EXPIRES_AT'] = expires_at.isoformat()
+        
+        # 파일 기록은 이벤트 루프를 막지 않도록 스레드에서 수행
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._persist_env(token, expires_at, env_file)
+        else:
+            task = loop.create_task(
+                asyncio.to_thread(self._persist_env, token, expires_at, env_file)
+            )
+            self._persist_tasks.add(task)
+            task.add_done_callback(self._persist_tasks.discard)
         self.log(f"토큰 정보가 .env 파일에 저장되었습니다. (만료일시: {expires_at.strftime('%Y-%m-%d %H:%M:%S %Z')})")
     
+    def _persist_env(self, token: str, expires_at: datetime, env_file: str) -> None:
+        """토큰 정보를 .env 파일에 한 번에 기록"""
+        values = {
+            'LS_ACCESS_TOKEN': token,
+            'LS_TOKEN_EXPIRES_AT': expires_at.isoformat()
+        }
+        try:
+            lines = []
+            if os.path.exists(env_file):
+                with open(env_file, 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+            
+            for i, line in enumerate(lines):
+                key = line.split('=', 1)[0].strip()
+                if key in values:
+                    lines[i] = f"{key}={values.pop(key)}"
+            lines.extend(f"{key}={value}" for key, value in values.items())
+            
+            with open(env_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except Exception as e:
+            self.log(f"토큰 정보 파일 저장 중 오류 발생: {e}", 'error')
+    
     def is_token_valid(self) -> bool:
         """저장된 토큰의 유효성 검사"""
+        # 메모리에 보관된 토큰 우선 확인
+        if self.token and self.token_expires_at:
+            return time.monotonic() < self._refresh_deadline
+        
+        # 시작 시에는 .env에서 읽어온 값 사용
         saved_token = os.getenv('LS_ACCESS_TOKEN')
         saved_expires_at = os.getenv('LS_TOKEN_EXPIRES_AT')
         
@@ -52,7 +101,7 @@ class TokenManager(BaseHandler):
             
             # naive datetime을 aware datetime으로 변환
             if expires_at.tzinfo is None:
-                expires_at = self.kst.localize(expires_at)
+                expires_at = expires_at.replace(tzinfo=self.kst)
             
             # 만료 5분 전부터는 갱신 필요
             if expires_at - timedelta(seconds=ls_config.Timer.TOKEN_REFRESH_MARGIN) <= current_time:
@@ -60,6 +109,7 @@ class TokenManager(BaseHandler):
                 
             self.token = saved_token
             self.token_expires_at = expires_at
+            self._set_refresh_deadline(expires_at)
             return True
         except Exception as e:
             self.log(f"토큰 유효성 검사 중 오류 발생: {e}", 'error')
@@ -71,7 +121,49 @@ class TokenManager(BaseHandler):
         if self.is_token_valid():
             self.log("유효한 토큰이 이미 저장되어 있습니다.")
             return self.token
-            
+        
+        async with self._lock:
+            # 대기 중 다른 코루틴이 이미 발급한 경우 재사용
+            if self.is_token_valid():
+                return self.token
+            return await self._request_token()
+    
+    def add_token_listener(self, callback: Callable[[str], None]) -> None:
+        """자동 갱신된 토큰을 전달받을 콜백 등록"""
+        self._token_listeners.append(callback)
+    
+    def start_auto_refresh(self) -> None:
+        """만료 전 자동 갱신 태스크 시작"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._auto_refresh())
+    
+    async def _auto_refresh(self) -> None:
+        """갱신 시점까지 대기 후 토큰 재발급 (실패 시 재시도)"""
+        while True:
+            await asyncio.sleep(max(0.0, self._refresh_deadline - time.monotonic()))
+            try:
+                async with self._lock:
+                    if self.is_token_valid():
+                        continue
+                    token = await self._request_token()
+                for callback in self._token_listeners:
+                    callback(token)
+            except Exception as e:
+                self.log(f"토큰 자동 갱신 실패, 재시도합니다: {e}", 'error')
+                await asyncio.sleep(ls_config.Timer.TOKEN_REFRESH_MARGIN / 10)
+    
+    async def cleanup(self) -> None:
+        """정리 작업"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+    
+    async def _request_token(self) -> str:
+        """토큰 발급 API 호출"""
         headers = {
             "Content-Type": "application/x-www-form-urlencoded"
         }
@@ -88,24 +180,24 @@ class TokenManager(BaseHandler):
         self.log(f"Headers: {headers}")
         self.log(f"Data: {data}")
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(self.token_url, headers=headers, data=data) as response:
-                    self.log(f"\n응답 상태 코드: {response.status}")
-                    result = await response.json()
-                    self.log(f"응답 데이터: {json.dumps(result, indent=2)}")
+        session = await self.http_client.get_session()
+        try:
+            async with session.post(self.token_url, headers=headers, data=data) as response:
+                self.log(f"\n응답 상태 코드: {response.status}")
+                result = await response.json()
+                self.log(f"응답 데이터: {json.dumps(result, indent=2)}")
+                
+                if response.status == 200:
+                    token = result.get("access_token")
+                    expires_in = result.get("expires_in")
+                    self.save_token_to_env(token, expires_in)
+                    return token
+                else:
+                    error_msg = f"\n토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}"
+                    self.log(error_msg, 'error')
+                    raise Exception(error_msg)
                     
-                    if response.status == 200:
-                        token = result.get("access_token")
-                        expires_in = result.get("expires_in")
-                        self.save_token_to_env(token, expires_in)
-                        return token
-                    else:
-                        error_msg = f"\n토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}"
-                        self.log(error_msg, 'error')
-                        raise Exception(error_msg)
-                        
-            except Exception as e:
-                error_msg = f"\n토큰 발급 중 오류 발생: {str(e)}"
-                self.log(error_msg, 'error')
-                raise 
\ No newline at end of file
+        except Exception as e:
+            error_msg = f"\n토큰 발급 중 오류 발생: {str(e)}"
+            self.log(error_msg, 'error')
+            raise 
\ No newline at end of file
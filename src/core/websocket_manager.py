@@ -1,74 +1,140 @@
 """웹소켓 관리 모듈"""
-import json
 import asyncio
-import websockets
-from typing import Optional
+import random
+import aiohttp
+import orjson
+from typing import Optional, List, Callable, Awaitable
 
 from src.core.base_handler import BaseHandler
+from src.core.http_client import HttpClient
 from config.settings import ls_config
 
 class WebSocketManager(BaseHandler):
     """웹소켓 관리 클래스"""
-    def __init__(self, url: str, token: str):
+    def __init__(self, url: str, token: str, http_client: Optional[HttpClient] = None):
         super().__init__('WebSocketManager')
         self.url = url
         self.token = token
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or HttpClient()
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.event_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=getattr(ls_config.WebSocket, 'QUEUE_MAX', 10000)
+        )
         self.is_running = True
         self.reconnect_delay = ls_config.WebSocket.RECONNECT_DELAY
+        self.max_reconnect_delay = getattr(ls_config.WebSocket, 'MAX_RECONNECT_DELAY', 60)
         self.max_reconnect_attempts = ls_config.WebSocket.MAX_RECONNECT_ATTEMPTS
         self.reconnect_count = 0
+        self.on_reconnect: Optional[Callable[[], Awaitable[None]]] = None  # 재연결 직후 호출할 코루틴 (구독 복구 등)
+        self.on_shutdown: Optional[Callable[[], Awaitable[None]]] = None  # 종료 시 연결이 닫히기 전에 호출할 코루틴
         
-    async def connect(self) -> None:
-        """웹소켓 연결"""
-        try:
-            async with websockets.connect(self.url) as ws:
-                self.ws = ws
-                self.log("웹소켓을 성공적으로 연결했습니다.")
-                await self._handle_connection()
-        except Exception as e:
-            self.log(f"웹소켓 연결 실패: {e}", 'error')
-            await self._handle_reconnection()
+    async def run(self) -> None:
+        """웹소켓 연결 및 수신 루프 (연결 종료 시 재연결)"""
+        while self.is_running:
+            try:
+                # 압축 협상을 끄고 프레임 크기 상한을 넉넉히 설정 (수신 프레임 압축 해제 비용 제거)
+                session = await self.http_client.get_session()
+                async with session.ws_connect(self.url, max_msg_size=2 ** 24, compress=0) as ws:
+                    self.ws = ws
+                    is_reconnect = self.reconnect_count > 0
+                    self.reconnect_count = 0
+                    self.log("웹소켓을 성공적으로 연결했습니다.")
+                    try:
+                        if is_reconnect:
+                            await self._call_hook(self.on_reconnect)
+                        # 종료 프레임 수신 시 반복이 끝나며, PING/PONG은 aiohttp가 자동 처리
+                        async for msg in ws:
+                            if msg.type is aiohttp.WSMsgType.TEXT or msg.type is aiohttp.WSMsgType.BINARY:
+                                self._enqueue(msg.data)
+                            elif msg.type is aiohttp.WSMsgType.ERROR:
+                                self.log(f"웹소켓 수신 오류: {ws.exception()}", 'error')
+                                break
+                            if not self.is_running:
+                                await self._call_hook(self.on_shutdown)
+                                break
+                    except asyncio.CancelledError:
+                        # 작업 취소(종료) 시에도 연결이 열려 있는 동안 종료 처리 수행
+                        await self._call_hook(self.on_shutdown)
+                        raise
+                    finally:
+                        self.ws = None
+                self.log("웹소켓 연결이 종료되었습니다.")
+            except Exception as e:
+                self.log(f"웹소켓 연결 실패: {e}", 'error')
+            
+            if not await self._handle_reconnection():
+                break
     
-    async def _handle_connection(self) -> None:
-        """웹소켓 연결 처리"""
+    async def _call_hook(self, hook: Optional[Callable[[], Awaitable[None]]]) -> None:
+        """연결이 열려 있는 동안 등록된 처리 호출 (오류는 기록만 하고 수신 루프 유지)"""
+        if hook:
+            try:
+                await hook()
+            except Exception as e:
+                self.log(f"연결 이벤트 처리 중 오류 발생: {e}", 'error')
+    
+    def _enqueue(self, message) -> None:
+        """수신 메시지 적재 (큐가 가득 차면 가장 오래된 메시지 폐기)"""
         try:
-            while self.is_running and self.ws:
-                message = await self.ws.recv()
-                await self.event_queue.put(message)
-        except websockets.exceptions.ConnectionClosed:
-            self.log("웹소켓 연결이 종료되었습니다.")
-            await self._handle_reconnection()
-        except Exception as e:
-            self.log(f"웹소켓 처리 중 오류 발생: {e}", 'error')
-            await self._handle_reconnection()
+            self.event_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.event_queue.get_nowait()
+            self.event_queue.put_nowait(message)
+            self.log("이벤트 큐가 가득 차 가장 오래된 메시지를 폐기했습니다.", 'warning')
     
-    async def _handle_reconnection(self) -> None:
-        """재연결 처리"""
+    async def _handle_reconnection(self) -> bool:
+        """재연결 대기 (재연결을 시도할 경우 True 반환)"""
         if not self.is_running:
-            return
+            return False
             
         self.reconnect_count += 1
-        if self.reconnect_count <= self.max_reconnect_attempts:
-            self.log(f"{self.reconnect_delay}초 후 재연결을 시도합니다... (시도 {self.reconnect_count}/{self.max_reconnect_attempts})")
-            await asyncio.sleep(self.reconnect_delay)
-            await self.connect()
-        else:
+        if self.reconnect_count > self.max_reconnect_attempts:
             self.log("최대 재연결 시도 횟수를 초과했습니다.")
             self.is_running = False
+            return False
+            
+        # 지수 백오프 + 지터로 동시 재접속 분산
+        backoff = min(self.max_reconnect_delay, self.reconnect_delay * (2 ** (self.reconnect_count - 1)))
+        delay = backoff * random.uniform(0.5, 1.5)
+        self.log(f"{delay:.1f}초 후 재연결을 시도합니다... (시도 {self.reconnect_count}/{self.max_reconnect_attempts})")
+        await asyncio.sleep(delay)
+        return True
     
     async def send(self, message: dict) -> None:
         """메시지 전송"""
         if self.ws:
             try:
-                await self.ws.send(json.dumps(message))
+                # 서버는 텍스트 프레임을 기대하므로 bytes 결과를 str로 변환하여 전송
+                await self.ws.send_str(orjson.dumps(message).decode())
             except Exception as e:
+                # 재연결은 run() 수신 루프가 연결 종료를 감지하여 처리
                 self.log(f"메시지 전송 중 오류 발생: {e}", 'error')
-                await self._handle_reconnection()
     
-    def cleanup(self) -> None:
+    async def send_raw(self, message: str) -> None:
+        """직렬화된 메시지 전송"""
+        if self.ws:
+            try:
+                await self.ws.send_str(message)
+            except Exception as e:
+                self.log(f"메시지 전송 중 오류 발생: {e}", 'error')
+    
+    async def send_batch(self, messages: List[str]) -> int:
+        """직렬화된 메시지 일괄 전송 (전송한 메시지 수 반환)"""
+        sent = 0
+        if self.ws:
+            try:
+                for message in messages:
+                    await self.ws.send_str(message)
+                    sent += 1
+            except Exception as e:
+                self.log(f"메시지 일괄 전송 중 오류 발생: {e}", 'error')
+        return sent
+    
+    async def cleanup(self) -> None:
         """정리 작업"""
         self.is_running = False
         if self.ws:
-            asyncio.create_task(self.ws.close())
\ No newline at end of file
+            await self.ws.close()
+        if self._owns_http_client:
+            await self.http_client.close()
\ No newline at end of file
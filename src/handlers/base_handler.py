@@ -1,20 +1,31 @@
 """기본 핸들러 모듈"""
-import pytz
-from abc import ABC, abstractmethod
+import logging
+from zoneinfo import ZoneInfo
 from src.utils.logger import setup_logger
 
-class BaseHandler(ABC):
+class BaseHandler:
     """기본 핸들러 클래스"""
+    __slots__ = ('kst', 'logger_name', 'logger', '_log_methods')
     _logger = None  # 클래스 변수로 로거 객체 저장
     
     def __init__(self, logger_name: str):
-        self.kst = pytz.timezone('Asia/Seoul')
+        self.kst = ZoneInfo('Asia/Seoul')
         self.logger_name = logger_name
         if BaseHandler._logger is None:
             BaseHandler._logger = setup_logger('VIMonitor')
         self.logger = BaseHandler._logger
+        
+        # 레벨별 (레벨 번호, 로깅 메서드) 바인딩
+        self._log_methods = {
+            'debug': (logging.DEBUG, self.logger.debug),
+            'info': (logging.INFO, self.logger.info),
+            'warning': (logging.WARNING, self.logger.warning),
+            'error': (logging.ERROR, self.logger.error),
+            'critical': (logging.CRITICAL, self.logger.critical),
+        }
     
     def log(self, message: str, level: str = 'info') -> None:
         """통합 로깅 메서드"""
-        log_message = f"[{self.logger_name}] {message}"
-        getattr(self.logger, level)(log_message) 
\ No newline at end of file
+        levelno, log_method = self._log_methods[level]
+        if self.logger.isEnabledFor(levelno):
+            log_method(f"[{self.logger_name}] {message}")
@@ -1,22 +1,61 @@
 """체결 이벤트 처리 모듈"""
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Union
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson 미설치 환경에서는 표준 json 사용
+    _json_loads = json.loads
 
 from src.handlers.base_handler import BaseHandler
 from src.core.websocket_manager import WebSocketManager
 from src.handlers.vi_event_handler import VIEventHandler
 
+# 파싱이 필요한 메시지에만 포함되는 문자열 (처리 대상 tr_cd, 시스템 응답)
+_MESSAGE_MARKERS = ('"VI_"', '"S3_"', '"K3_"', '"rsp_msg"')
+_MESSAGE_MARKERS_BYTES = tuple(marker.encode() for marker in _MESSAGE_MARKERS)
+
+# header가 본문보다 앞에 오므로 앞부분만 검사해 tr_cd를 판별 (체결 메시지가 대부분이므로 먼저 검사)
+_HEADER_SCAN_LEN = 64
+_TR_CD_MARKERS = (('"S3_"', "S3_"), ('"K3_"', "K3_"), ('"VI_"', "VI_"))
+_TR_CD_MARKERS_BYTES = tuple((marker.encode(), tr_cd) for marker, tr_cd in _TR_CD_MARKERS)
+
 class CcldEventHandler(BaseHandler):
     """체결 이벤트 처리 클래스"""
+    __slots__ = ('ws_manager', 'vi_handler', '_dispatch')
+    
     def __init__(self, ws_manager: WebSocketManager, vi_handler: VIEventHandler):
         super().__init__('CcldEventHandler')
         self.ws_manager = ws_manager
         self.vi_handler = vi_handler
         
-    async def process_message(self, message: str) -> None:
+        # tr_cd별 메시지 처리 메서드
+        self._dispatch = {
+            "VI_": self._process_vi_message,
+            "S3_": self._process_trade_message,
+            "K3_": self._process_trade_message,
+        }
+        
+    async def process_message(self, message: Union[str, bytes]) -> None:
         """메시지 처리"""
+        is_bytes = isinstance(message, bytes)
+        
+        # 메시지 앞부분에서 tr_cd를 찾으면 파싱 후 바로 해당 처리 메서드 호출
+        head = message[:_HEADER_SCAN_LEN]
+        handler = None
+        for marker, tr_cd in (_TR_CD_MARKERS_BYTES if is_bytes else _TR_CD_MARKERS):
+            if marker in head:
+                handler = self._dispatch[tr_cd]
+                break
+        else:
+            # 처리 대상이 아닌 메시지는 JSON 파싱 전에 제외
+            markers = _MESSAGE_MARKERS_BYTES if is_bytes else _MESSAGE_MARKERS
+            if not any(marker in message for marker in markers):
+                return
+        
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             if not isinstance(data, dict):
                 self.log("잘못된 메시지 형식입니다.")
                 return
@@ -28,13 +67,12 @@ class CcldEventHandler(BaseHandler):
                 await self._process_system_message(header)
                 return
             
-            tr_cd = header.get("tr_cd")
-            if tr_cd == "VI_":
-                await self._process_vi_message(data)
-            elif tr_cd in ["S3_", "K3_"]:
-                await self._process_trade_message(data)
+            if handler is None:
+                handler = self._dispatch.get(header.get("tr_cd"))
+            if handler:
+                await handler(data)
                 
-        except json.JSONDecodeError as e:
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError도 하위 클래스
             self.log(f"JSON 파싱 오류: {e}", 'error')
         except Exception as e:
             self.log(f"메시지 처리 중 오류 발생: {e}", 'error')
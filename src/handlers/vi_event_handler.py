@@ -1,42 +1,66 @@
 """VI 이벤트 처리 모듈"""
-import json
-from datetime import datetime
 import asyncio
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, Tuple
 
 from src.core.base_handler import BaseHandler
 from src.core.websocket_manager import WebSocketManager
 from src.core.data_manager import DataManager
+from src.utils.time_utils import hhmmss_now
 from config.settings import ls_config
 
+# 구독/해지 메시지 JSON 형식 (token, tr_type, tr_cd를 채운 뒤 종목코드만 치환)
+_MESSAGE_FORMAT = '{"header":{"token":"%s","tr_type":"%s"},"body":{"tr_cd":"%s","tr_key":"%%s"}}'
+
 class VIEventHandler(BaseHandler):
     """VI 이벤트 처리 및 체결 구독 관리 클래스"""
+    __slots__ = ('ws_manager', 'data_manager', 'is_reconnecting', '_msg_templates',
+                 '_vi_status', '_trade_sub', '_trade_unsub')
+    
     def __init__(self, ws_manager: WebSocketManager, data_manager: DataManager):
         super().__init__('VIEventHandler')
         self.ws_manager = ws_manager
         self.data_manager = data_manager
         self.is_reconnecting = False
+        self._msg_templates: Dict[Tuple[str, str], str] = {}  # (tr_cd, tr_type)별 직렬화된 메시지 템플릿
+        
+        # 이벤트마다 참조하는 설정값 미리 바인딩
+        self._vi_status = ls_config.VI.STATUS
+        self._trade_sub = ls_config.TRADE_TYPES["SUBSCRIBE"]
+        self._trade_unsub = ls_config.TRADE_TYPES["UNSUBSCRIBE"]
+    
+    def _build_message(self, tr_cd: str, tr_type: str, stock_code: str) -> str:
+        """구독/해지 메시지 생성 (직렬화된 템플릿에 종목코드만 치환)"""
+        template = self._msg_templates.get((tr_cd, tr_type))
+        if template is None:
+            template = _MESSAGE_FORMAT % (self.ws_manager.token, tr_type, tr_cd)
+            self._msg_templates[(tr_cd, tr_type)] = template
+        return template % stock_code
+    
+    def update_token(self, token: str) -> None:
+        """갱신된 토큰 반영 (이전 토큰으로 만든 메시지 템플릿 폐기)"""
+        self.ws_manager.token = token
+        self._msg_templates.clear()
     
-    def get_tr_cd(self, market_type: str) -> str:
-        """시장 구분을 tr_cd로 변환"""
-        return ls_config.MARKET_CODES.get(market_type, market_type)
-
     async def handle_vi_event(self, vi_data: Dict[str, Any]) -> None:
         """VI 이벤트 처리"""
         body = vi_data.get("body", {})
-        current_time = datetime.now(self.kst)
-        timestamp = current_time.strftime("%H:%M:%S")
+        stock_code = body.get('ref_shcode')
         
+        # 로드되지 않은 종목(ETN, 워런트 등)은 포맷팅 전에 제외
+        if not self.data_manager.is_known_code(stock_code):
+            return
+        
+        timestamp = hhmmss_now(self.kst)
         vi_gubun = body.get("vi_gubun", "0")
-        vi_status = ls_config.VI.STATUS.get(vi_gubun, "알 수 없음")
+        vi_status = self._vi_status.get(vi_gubun, "알 수 없음")
         
-        stock_code = body.get('ref_shcode')
         stock_info = self.data_manager.get_stock_info(stock_code)
         if not stock_info:
             return
             
         market_type = stock_info.market
-        tr_cd = self.get_tr_cd(market_type)
+        tr_cd = stock_info.tr_cd
         
         # VI 상태 정보를 한 줄로 출력
         vi_message = (f"[{timestamp}] [VI {vi_status}] {market_type} | {stock_info.name}({stock_code}) | "
@@ -67,70 +91,63 @@ class VIEventHandler(BaseHandler):
             return
             
         # 체결 정보를 간단하게 출력
-        current_time = datetime.now(self.kst)
-        trade_message = (f"[{current_time.strftime('%H:%M:%S')}] 체결 | {stock_info.name}({stock_code}) | "
+        trade_message = (f"[{hhmmss_now(self.kst)}] 체결 | {stock_info.name}({stock_code}) | "
                         f"{body.get('price'):>7}원 | {body.get('cvolume'):>6}주")
         self.log(trade_message)
 
+    def _log_active_stocks(self) -> None:
+        """현재 구독 중인 종목 목록 출력"""
+        if self.is_reconnecting or not self.logger.isEnabledFor(logging.INFO):
+            return
+        active_stocks = self.data_manager.get_sorted_active_stocks()
+        self.log(f">>> 현재 구독 중인 종목 수: {len(active_stocks)}개 ({', '.join(active_stocks)})")
+
     async def subscribe_trade_data(self, stock_code: str, market_type: str) -> None:
         """체결 정보 구독"""
-        message = {
-            "header": {
-                "token": self.ws_manager.token,
-                "tr_type": ls_config.TRADE_TYPES["SUBSCRIBE"]
-            },
-            "body": {
-                "tr_cd": market_type,
-                "tr_key": stock_code
-            }
-        }
-        await self.ws_manager.send(message)
+        message = self._build_message(market_type, self._trade_sub, stock_code)
+        await self.ws_manager.send_raw(message)
         
-        if not self.is_reconnecting:
-            active_stocks = self.data_manager.get_active_stocks()
-            self.log(f">>> 현재 구독 중인 종목 수: {len(active_stocks)}개 ({', '.join(sorted(active_stocks))})")
+        self._log_active_stocks()
 
     async def unsubscribe_trade_data(self, stock_code: str, market_type: str) -> None:
         """체결 정보 구독 해제"""
-        message = {
-            "header": {
-                "token": self.ws_manager.token,
-                "tr_type": ls_config.TRADE_TYPES["UNSUBSCRIBE"]
-            },
-            "body": {
-                "tr_cd": market_type,
-                "tr_key": stock_code
-            }
-        }
-        await self.ws_manager.send(message)
+        message = self._build_message(market_type, self._trade_unsub, stock_code)
+        await self.ws_manager.send_raw(message)
         self.data_manager.remove_vi_stock(stock_code)
         
-        if not self.is_reconnecting:
-            active_stocks = self.data_manager.get_active_stocks()
-            self.log(f">>> 현재 구독 중인 종목 수: {len(active_stocks)}개 ({', '.join(sorted(active_stocks))})")
+        self._log_active_stocks()
 
     async def handle_reconnection(self) -> None:
         """재연결 처리"""
         self.is_reconnecting = True
         
         # 재연결 시 활성화된 VI 종목들의 체결 정보 재구독
+        # (LS 실시간 TR은 메시지당 tr_key 하나만 허용하므로 종목별 메시지를 한 번에 전송)
+        messages = []
         for stock_code in self.data_manager.get_active_stocks():
             stock_info = self.data_manager.get_stock_info(stock_code)
             if stock_info:
-                market_type = self.get_tr_cd(stock_info.market)
-                await self.subscribe_trade_data(stock_code, market_type)
+                messages.append(self._build_message(stock_info.tr_cd, self._trade_sub, stock_code))
+        try:
+            sent = await self.ws_manager.send_batch(messages)
+        finally:
+            self.is_reconnecting = False
         
-        self.is_reconnecting = False
+        if sent < len(messages):
+            self.log(f">>> 재구독 일부 실패: {sent}/{len(messages)}개 종목", 'warning')
+        else:
+            self.log(f">>> 재구독 완료: {sent}개 종목")
 
-    def cleanup(self) -> None:
+    async def cleanup(self) -> None:
         """정리 작업"""
         self.log("구독 정리 작업 시작...")
         
         # VI 발동된 모든 종목의 체결 정보 구독 해제
+        unsubscribes = []
         for stock_code in self.data_manager.get_active_stocks():
             stock_info = self.data_manager.get_stock_info(stock_code)
             if stock_info:
-                market_type = self.get_tr_cd(stock_info.market)
-                asyncio.create_task(self.unsubscribe_trade_data(stock_code, market_type))
+                unsubscribes.append(self.unsubscribe_trade_data(stock_code, stock_info.tr_cd))
+        await asyncio.gather(*unsubscribes, return_exceptions=True)
         
-        self.log("구독 정리 작업 완료") 
\ No newline at end of file
+        self.log("구독 정리 작업 완료")
@@ -1,30 +1,46 @@
 """메인 실행 모듈"""
-import os
+import sys
 import asyncio
 import csv
-import aiohttp
-from datetime import datetime
+import pickle
 from pathlib import Path
+from typing import Union
 
 from src.core.base_handler import BaseHandler
 from src.core.data_manager import DataManager
+from src.core.http_client import HttpClient
 from src.core.token_manager import TokenManager
 from src.core.websocket_manager import WebSocketManager
 from src.handlers.vi_event_handler import VIEventHandler
 from src.handlers.ccld_event_handler import CcldEventHandler
 from src.models.stock_info import StockInfo
 from src.utils.logger import setup_logger
+from src.utils.time_utils import yyyymmdd_now
 
 from config.settings import ls_config, STOCK_INFO_CACHE_SIZE, STOCK_INFO_DIR
 
+# uvloop 사용 가능 시 기본 이벤트 루프로 설정 (Windows 등 미지원 환경은 기본 루프 사용)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+MESSAGE_BATCH_SIZE = 64  # 한 번에 꺼내 처리할 최대 메시지 수
+STOCK_INFO_PATH = Path(STOCK_INFO_DIR)  # 종목 정보 파일 디렉토리
+
 class VIMonitor(BaseHandler):
     """VI 모니터링 메인 클래스"""
+    __slots__ = ('data_manager', 'http_client', 'token_manager', 'ws_manager',
+                 'vi_handler', 'ccld_handler', 'is_running')
+    
     def __init__(self):
         super().__init__('VIMonitor')
         
         # 컴포넌트 초기화
         self.data_manager = DataManager()
-        self.token_manager = TokenManager(ls_config.API.APP_KEY, ls_config.API.SECRET_KEY)
+        self.http_client = HttpClient()
+        self.token_manager = TokenManager(ls_config.API.APP_KEY, ls_config.API.SECRET_KEY, self.http_client)
         self.ws_manager = None
         self.vi_handler = None
         self.ccld_handler = None
@@ -42,38 +58,67 @@ class VIMonitor(BaseHandler):
             await self.load_stock_info(token)
             
             # 웹소켓 매니저 초기화
-            self.ws_manager = WebSocketManager(ls_config.WebSocket.WEBSOCKET_URL, token)
+            self.ws_manager = WebSocketManager(ls_config.WebSocket.WEBSOCKET_URL, token, self.http_client)
             
             # VI 이벤트 핸들러 초기화
             self.vi_handler = VIEventHandler(self.ws_manager, self.data_manager)
+            # 재연결 시 체결 구독 복구, 종료 시 웹소켓 연결이 닫히기 전에 체결 구독 해제
+            self.ws_manager.on_reconnect = self.vi_handler.handle_reconnection
+            self.ws_manager.on_shutdown = self.vi_handler.cleanup
             
             # 메시지 프로세서 초기화
             self.ccld_handler = CcldEventHandler(self.ws_manager, self.vi_handler)
             
+            # 자동 갱신된 토큰을 이후 구독/해지 메시지에 반영
+            self.token_manager.add_token_listener(self.vi_handler.update_token)
+            self.token_manager.start_auto_refresh()
+            
         except Exception as e:
             self.log(f"초기화 중 오류 발생: {e}", 'error')
             raise
     
     async def load_stock_info(self, token: str) -> None:
         """종목 정보 로드"""
-        today = datetime.now(self.kst).strftime('%Y%m%d')
-        os.makedirs(STOCK_INFO_DIR, exist_ok=True)
-        csv_file = os.path.join(STOCK_INFO_DIR, f'stocks_info_{today}.csv')
+        today = yyyymmdd_now(self.kst)
+        STOCK_INFO_PATH.mkdir(parents=True, exist_ok=True)
+        csv_file = STOCK_INFO_PATH / f'stocks_info_{today}.csv'
         
-        if os.path.exists(csv_file):
+        # CSV 파싱 없이 바로 복원 가능한 캐시 파일 우선 사용 (존재 확인 없이 바로 열기 시도)
+        try:
+            with open(f'{csv_file}.pkl', 'rb') as f:
+                stock_info = pickle.load(f)
+            # 체결 TR 코드가 빠진 캐시로 구독하지 않도록 검증
+            if not all(info.tr_cd for info in stock_info.values()):
+                raise ValueError("체결 TR 코드가 없는 종목이 있습니다")
+            self.data_manager.set_stock_info(stock_info)
+            self.log(f"오늘({today}) 저장된 종목 정보 캐시 파일을 불러옵니다.")
+            return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"종목 정보 캐시 파일 로드 실패, CSV 파일을 사용합니다: {e}", 'warning')
+        
+        if csv_file.is_file():
             self.log(f"오늘({today}) 저장된 종목 정보 파일을 불러옵니다.")
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    self.data_manager.stock_info[row['종목코드']] = StockInfo(
-                        name=row['종목명'],
-                        market=row['시장구분'],
-                        etf=row['ETF구분'] == 'True',
-                        upper_limit=int(row['상한가']),
-                        lower_limit=int(row['하한가']),
-                        prev_close=int(row['전일가']),
-                        base_price=int(row['기준가'])
+            intern = sys.intern  # 종목코드/시장구분 문자열을 단일 객체로 공유
+            with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                # 헤더에서 컬럼 위치를 한 번만 계산하고 행은 인덱스로 접근
+                columns = {name: i for i, name in enumerate(next(reader))}
+                code_i, name_i, market_i, etf_i = (columns[c] for c in ('종목코드', '종목명', '시장구분', 'ETF구분'))
+                upper_i, lower_i, prev_i, base_i = (columns[c] for c in ('상한가', '하한가', '전일가', '기준가'))
+                self.data_manager.set_stock_info({
+                    intern(row[code_i]): StockInfo(
+                        name=row[name_i],
+                        market=intern(row[market_i]),
+                        etf=row[etf_i] == 'True',
+                        upper_limit=int(row[upper_i]),
+                        lower_limit=int(row[lower_i]),
+                        prev_close=int(row[prev_i]),
+                        base_price=int(row[base_i])
                     )
+                    for row in reader
+                })
             return
         
         # API로 종목 정보 조회
@@ -93,86 +138,114 @@ class VIMonitor(BaseHandler):
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=headers, json=request_data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        stock_list = result.get("t8430OutBlock", [])
-                        
-                        # 종목 정보 저장
-                        for stock in stock_list:
-                            market = "KOSPI" if stock["gubun"] == "1" else "KOSDAQ"
-                            self.data_manager.stock_info[stock["shcode"]] = StockInfo(
-                                name=stock["hname"],
-                                market=market,
-                                etf=stock["etfgubun"] == "1",
-                                upper_limit=stock["uplmtprice"],
-                                lower_limit=stock["dnlmtprice"],
-                                prev_close=stock["jnilclose"],
-                                base_price=stock["recprice"]
-                            )
-                        
-                        # CSV 파일로 저장
-                        self.save_stock_info_to_csv(csv_file)
-                    else:
-                        raise Exception(f"종목 정보 조회 실패: {response.status}")
-            except Exception as e:
-                self.log(f"종목 정보 조회 중 오류 발생: {e}", 'error')
-                raise
+        session = await self.http_client.get_session()
+        try:
+            async with session.post(url, headers=headers, json=request_data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    stock_list = result.get("t8430OutBlock", [])
+                    
+                    # 종목 정보 저장
+                    stock_info = {}
+                    for stock in stock_list:
+                        market = "KOSPI" if stock["gubun"] == "1" else "KOSDAQ"
+                        stock_info[sys.intern(stock["shcode"])] = StockInfo(
+                            name=stock["hname"],
+                            market=market,
+                            etf=stock["etfgubun"] == "1",
+                            upper_limit=stock["uplmtprice"],
+                            lower_limit=stock["dnlmtprice"],
+                            prev_close=stock["jnilclose"],
+                            base_price=stock["recprice"]
+                        )
+                    self.data_manager.set_stock_info(stock_info)
+                    
+                    # CSV 파일로 저장 (이벤트 루프를 막지 않도록 스레드에서 수행)
+                    await asyncio.to_thread(self.save_stock_info_to_csv, csv_file)
+                else:
+                    raise Exception(f"종목 정보 조회 실패: {response.status}")
+        except Exception as e:
+            self.log(f"종목 정보 조회 중 오류 발생: {e}", 'error')
+            raise
     
-    def save_stock_info_to_csv(self, csv_file: str) -> None:
+    def save_stock_info_to_csv(self, csv_file: Union[str, Path]) -> None:
         """종목 정보를 CSV 파일로 저장"""
         with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for code, info in self.data_manager.stock_info.items():
-                writer.writerow({
-                    '종목코드': code,
-                    '종목명': info.name,
-                    '시장구분': info.market,
-                    'ETF구분': info.etf,
-                    '상한가': info.upper_limit,
-                    '하한가': info.lower_limit,
-                    '전일가': info.prev_close,
-                    '기준가': info.base_price
-                })
+            writer = csv.writer(f)
+            writer.writerow(['종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가'])
+            writer.writerows(
+                (code, info.name, info.market, info.etf,
+                 info.upper_limit, info.lower_limit, info.prev_close, info.base_price)
+                for code, info in self.data_manager.stock_info.items()
+            )
+        
+        # 다음 실행 시 CSV 파싱을 건너뛰기 위한 캐시 파일 저장
+        with open(f'{csv_file}.pkl', 'wb') as f:
+            pickle.dump(self.data_manager.stock_info, f, protocol=5)
     
     async def start(self) -> None:
         """모니터링 시작"""
         try:
             await self.initialize()
             
-            # 웹소켓 연결 시작
-            await self.ws_manager.connect()
-            
-            # 메시지 처리 루프
-            while self.is_running:
+            async with asyncio.TaskGroup() as task_group:
+                self.data_manager.set_task_group(task_group)
+                # 메시지 처리 루프와 웹소켓 수신 루프를 동시에 실행
+                consumer = task_group.create_task(self.process_messages())
                 try:
-                    message = await self.ws_manager.event_queue.get()
-                    await self.ccld_handler.process_message(message)
-                except asyncio.CancelledError:
-                    break
-                except Exception as e:
-                    self.log(f"메시지 처리 중 오류 발생: {e}", 'error')
+                    await self.ws_manager.run()
+                finally:
+                    # 태스크 그룹이 남은 태스크(VI 타이머 등)를 기다리기 전에 정리
+                    consumer.cancel()
+                    await self.cleanup()
+                    self.data_manager.set_task_group(None)
                     
         except Exception as e:
             self.log(f"모니터링 중 오류 발생: {e}", 'error')
         finally:
-            self.cleanup()
+            # 초기화 실패 등으로 위에서 정리하지 못한 경우
+            await self.cleanup()
     
-    def cleanup(self) -> None:
-        """정리 작업"""
+    async def process_messages(self) -> None:
+        """메시지 처리 루프 (대기 중인 메시지를 묶어서 처리)"""
+        queue = self.ws_manager.event_queue
+        process_message = self.ccld_handler.process_message
+        while self.is_running:
+            try:
+                batch = [await queue.get()]
+                try:
+                    while len(batch) < MESSAGE_BATCH_SIZE:
+                        batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    pass
+                
+                # VI 발동/해제 순서 보장을 위해 배치 내에서는 순차 처리
+                for message in batch:
+                    try:
+                        await process_message(message)
+                    except Exception as e:
+                        self.log(f"메시지 처리 중 오류 발생: {e}", 'error')
+            except asyncio.CancelledError:
+                break
+    
+    async def cleanup(self) -> None:
+        """정리 작업 (이미 정리된 경우 무시)"""
+        if not self.is_running:
+            return
         self.log("프로그램 종료 중...")
         self.is_running = False
         
+        # 구독 해지는 웹소켓 종료 직전 on_shutdown에서 수행되며, 여기서는 남은 구독 상태를 정리
         if self.vi_handler:
-            self.vi_handler.cleanup()
+            await self.vi_handler.cleanup()
+        
+        self.data_manager.cleanup()
         
         if self.ws_manager:
-            self.ws_manager.cleanup()
+            await self.ws_manager.cleanup()
+        
+        await self.token_manager.cleanup()
+        await self.http_client.close()
         
         self.log("프로그램이 종료되었습니다.")
 
@@ -183,10 +256,10 @@ async def main():
         await monitor.start()
     except KeyboardInterrupt:
         print("키보드 인터럽트가 감지되었습니다.")
-        monitor.cleanup()
+        await monitor.cleanup()
     except Exception as e:
         print(f"예상치 못한 오류가 발생했습니다: {e}")
-        monitor.cleanup()
+        await monitor.cleanup()
 
 if __name__ == "__main__":
     try:
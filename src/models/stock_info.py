@@ -1,7 +1,9 @@
 """종목 정보 모델"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-@dataclass
+from config.settings import ls_config
+
+@dataclass(slots=True, frozen=True)
 class StockInfo:
     """종목 정보를 저장하는 데이터 클래스"""
     name: str
@@ -10,4 +12,8 @@ class StockInfo:
     upper_limit: int
     lower_limit: int
     prev_close: int
-    base_price: int 
\ No newline at end of file
+    base_price: int
+    tr_cd: str = field(init=False, repr=False)  # 시장별 체결 TR 코드 (market에서 생성 시 한 번 결정)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'tr_cd', ls_config.MARKET_CODES.get(self.market, self.market))
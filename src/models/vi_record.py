@@ -0,0 +1,10 @@
+"""VI 구독 이력 모델"""
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass(slots=True, frozen=True)
+class VIRecord:
+    """VI 발동부터 구독 해지까지의 이력을 저장하는 데이터 클래스"""
+    activation_time: datetime
+    deactivation_time: datetime
+    status: str = '해지완료'
@@ -1,10 +1,17 @@
 """로깅 유틸리티"""
-import os
+import queue
+import atexit
 import logging
-from datetime import datetime
-import pytz
-from logging.handlers import RotatingFileHandler
-from config.settings import LOG_FORMAT, LOG_DATE_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+import functools
+from datetime import datetime, time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
+from config.settings import LOG_FORMAT, LOG_DATE_FORMAT, LOG_BACKUP_COUNT
+
+KST = ZoneInfo('Asia/Seoul')
+LOG_DIR = Path(__file__).resolve().parents[2] / 'logs'  # 프로젝트 루트의 logs 디렉토리
+LOG_FILE_NAME = 'vi_monitor.log'  # 교체된 파일은 vi_monitor.log.YYYY-MM-DD로 보관
 
 def setup_logger(name: str) -> logging.Logger:
     """로거 설정"""
@@ -15,20 +22,25 @@ def setup_logger(name: str) -> logging.Logger:
     if logger.handlers:
         return logger
     
-    # 로그 디렉토리 생성
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
-    os.makedirs(log_dir, exist_ok=True)
+    # 핸들러 추가 (파일/콘솔 출력은 공유 큐를 통해 별도 스레드에서 처리)
+    logger.addHandler(QueueHandler(get_log_queue()))
     
-    # 로그 파일 경로
-    log_file = os.path.join(log_dir, get_log_file_name())
+    return logger 
+
+@functools.lru_cache(maxsize=1)
+def get_log_queue() -> queue.SimpleQueue:
+    """모든 로거가 공유하는 로그 큐 반환 (최초 호출 시 출력 스레드 시작)"""
+    # 로그 디렉토리 생성
+    LOG_DIR.mkdir(exist_ok=True)
     
     # 포맷터 생성
     formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
     
-    # 파일 핸들러 생성
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=LOG_MAX_BYTES,
+    # 파일 핸들러 생성 (한국 시간 자정마다 교체, 같은 파일을 여러 핸들러가 교체하지 않도록 하나만 생성)
+    file_handler = TimedRotatingFileHandler(
+        LOG_DIR / LOG_FILE_NAME,
+        when='midnight',
+        atTime=get_rollover_time(),
         backupCount=LOG_BACKUP_COUNT,
         encoding='utf-8'
     )
@@ -38,14 +50,15 @@ def setup_logger(name: str) -> logging.Logger:
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     
-    # 핸들러 추가
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # 파일/콘솔 출력은 별도 스레드에서 처리하고 로거는 큐에만 적재
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
-    return logger 
+    return log_queue
 
-def get_log_file_name() -> str:
-    """오늘 날짜 기준 로그 파일명 반환"""
-    kst = pytz.timezone('Asia/Seoul')
-    today = datetime.now(kst).strftime('%Y%m%d')
-    return f'vi_monitor_{today}.log' 
\ No newline at end of file
+def get_rollover_time() -> time:
+    """한국 시간 자정을 시스템 로컬 시각으로 변환한 로그 교체 시각 반환"""
+    kst_midnight = datetime.now(KST).replace(hour=0, minute=0, second=0, microsecond=0)
+    return kst_midnight.astimezone().time()
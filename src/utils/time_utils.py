@@ -0,0 +1,25 @@
+"""시간 유틸리티"""
+import time
+from datetime import datetime, timedelta, tzinfo
+
+_hhmmss_cache = [-1, None, ""]  # [epoch 초, 시간대, 포맷된 문자열]
+_yyyymmdd_cache = [0.0, None, ""]  # [다음 자정 epoch, 시간대, 포맷된 문자열]
+
+def hhmmss_now(tz: tzinfo) -> str:
+    """현재 시각을 HH:MM:SS 문자열로 반환 (같은 초, 같은 시간대에서는 캐시 사용)"""
+    now = int(time.time())
+    if now != _hhmmss_cache[0] or tz != _hhmmss_cache[1]:
+        _hhmmss_cache[0] = now
+        _hhmmss_cache[1] = tz
+        _hhmmss_cache[2] = datetime.fromtimestamp(now, tz).strftime('%H:%M:%S')
+    return _hhmmss_cache[2]
+
+def yyyymmdd_now(tz: tzinfo) -> str:
+    """오늘 날짜를 YYYYMMDD 문자열로 반환 (같은 시간대에서 자정이 지나기 전까지는 캐시 사용)"""
+    if time.time() >= _yyyymmdd_cache[0] or tz != _yyyymmdd_cache[1]:
+        now = datetime.now(tz)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        _yyyymmdd_cache[0] = midnight.timestamp()
+        _yyyymmdd_cache[1] = tz
+        _yyyymmdd_cache[2] = now.strftime('%Y%m%d')
+    return _yyyymmdd_cache[2]
@@ -1 +1,62 @@
- 
\ No newline at end of file
+import pytest
+import asyncio
+from unittest.mock import Mock, AsyncMock, patch
+from src.core.data_manager import DataManager
+from config.settings import ls_config
+
+@pytest.fixture
+def data_manager(test_logger):
+    return DataManager()
+
+@pytest.mark.asyncio
+async def test_vi_timer_expires(data_manager):
+    """VI 타이머 만료 시 콜백 호출 테스트"""
+    callback = AsyncMock()
+    data_manager.add_vi_stock("005930")
+    
+    with patch.object(ls_config.VI, 'SUBSCRIPTION_TIMEOUT', 0.01):
+        await data_manager.start_vi_timer("005930", callback)
+        await asyncio.sleep(0.05)
+    
+    callback.assert_called_once_with("005930")
+    assert data_manager._vi_expiry_task is None
+
+@pytest.mark.asyncio
+async def test_vi_timer_cancelled_on_remove(data_manager):
+    """VI 종목 제거 시 타이머 취소 테스트"""
+    callback = AsyncMock()
+    data_manager.add_vi_stock("005930")
+    
+    with patch.object(ls_config.VI, 'SUBSCRIPTION_TIMEOUT', 0.01):
+        await data_manager.start_vi_timer("005930", callback)
+        data_manager.remove_vi_stock("005930")
+        await asyncio.sleep(0.05)
+    
+    callback.assert_not_called()
+    assert "005930" in data_manager.unsubscribed_stocks
+    assert data_manager.unsubscribed_stocks["005930"].status == '해지완료'
+
+@pytest.mark.asyncio
+async def test_vi_timers_share_single_task(data_manager):
+    """여러 종목의 타이머가 하나의 태스크를 공유하는지 테스트"""
+    callback = AsyncMock()
+    for stock_code in ("005930", "000660"):
+        data_manager.add_vi_stock(stock_code)
+        await data_manager.start_vi_timer(stock_code, callback)
+    
+    task = data_manager._vi_expiry_task
+    assert task is not None
+    assert list(data_manager._vi_deadlines) == ["005930", "000660"]
+    
+    data_manager.cleanup()
+    await asyncio.sleep(0)
+    assert task.cancelled() or task.done()
+
+def test_set_stock_info_updates_known_codes(data_manager):
+    """종목 정보 설정 시 종목코드 집합 갱신 테스트"""
+    stock_info = Mock()
+    data_manager.set_stock_info({"005930": stock_info})
+    
+    assert data_manager.is_known_code("005930")
+    assert not data_manager.is_known_code("999999")
+    assert data_manager.get_stock_info("005930") is stock_info
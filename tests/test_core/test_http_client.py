@@ -0,0 +1,24 @@
+import pytest
+from src.core.http_client import HttpClient
+
+@pytest.mark.asyncio
+async def test_get_session_reuses_session():
+    """공유 세션 재사용 테스트"""
+    http_client = HttpClient()
+    try:
+        session = await http_client.get_session()
+        assert await http_client.get_session() is session
+    finally:
+        await http_client.close()
+
+@pytest.mark.asyncio
+async def test_close_recreates_session():
+    """세션 종료 후 재생성 테스트"""
+    http_client = HttpClient()
+    session = await http_client.get_session()
+    await http_client.close()
+    
+    assert session.closed
+    new_session = await http_client.get_session()
+    assert new_session is not session
+    await http_client.close()
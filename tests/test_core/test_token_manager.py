@@ -1,5 +1,6 @@
 import pytest
 import os
+import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock
 from src.core.token_manager import TokenManager
@@ -64,7 +65,7 @@ def test_is_token_valid(token_manager):
 
 def test_save_token_to_env(token_manager):
     """토큰 저장 테스트"""
-    with patch('src.core.token_manager.set_key') as mock_set_key:
+    with patch.object(token_manager, '_persist_env') as mock_persist_env:
         token = "test_token"
         expires_in = 3600
         
@@ -72,7 +73,7 @@ def test_save_token_to_env(token_manager):
         
         assert token_manager.token == token
         assert token_manager.token_expires_at is not None
-        assert mock_set_key.call_count == 2
+        mock_persist_env.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_save_token_to_env(token_manager, tmp_path):
@@ -114,4 +115,60 @@ async def test_save_token_to_env(token_manager, tmp_path):
         if original_expires_at:
             os.environ['LS_TOKEN_EXPIRES_AT'] = original_expires_at
         elif 'LS_TOKEN_EXPIRES_AT' in os.environ:
-            del os.environ['LS_TOKEN_EXPIRES_AT'] 
\ No newline at end of file
+            del os.environ['LS_TOKEN_EXPIRES_AT'] 
+
+def test_is_token_valid_uses_refresh_deadline(test_logger, test_config):
+    """메모리 토큰의 갱신 시점 기준 유효성 검사 테스트"""
+    manager = TokenManager(api_key=test_config["api_key"], api_secret=test_config["api_secret"])
+    with patch.object(manager, '_persist_env'):
+        manager.save_token_to_env("test_token", 3600)
+    assert manager.is_token_valid()
+    
+    manager._refresh_deadline = 0.0
+    assert not manager.is_token_valid()
+
+@pytest.mark.asyncio
+async def test_auto_refresh_requests_new_token(test_logger, test_config):
+    """갱신 시점 도달 시 자동 재발급 테스트"""
+    manager = TokenManager(api_key=test_config["api_key"], api_secret=test_config["api_secret"])
+    manager.token = "old_token"
+    manager.token_expires_at = datetime.now(manager.kst)
+    
+    refreshed = asyncio.Event()
+    async def request_token():
+        manager._refresh_deadline = float('inf')
+        refreshed.set()
+        return "new_token"
+    
+    with patch.object(manager, '_request_token', side_effect=request_token) as mock_request:
+        manager.start_auto_refresh()
+        await asyncio.wait_for(refreshed.wait(), 1)
+        await manager.cleanup()
+    
+    mock_request.assert_called_once()
+    assert manager._refresh_task is None
+
+@pytest.mark.asyncio
+async def test_auto_refresh_notifies_token_listeners(test_logger, test_config):
+    """자동 갱신된 토큰의 콜백 전달 테스트"""
+    manager = TokenManager(api_key=test_config["api_key"], api_secret=test_config["api_secret"])
+    manager.token = "old_token"
+    manager.token_expires_at = datetime.now(manager.kst)
+    
+    refreshed = asyncio.Event()
+    received = []
+    def on_token(token):
+        received.append(token)
+        refreshed.set()
+    manager.add_token_listener(on_token)
+    
+    async def request_token():
+        manager._refresh_deadline = float('inf')
+        return "new_token"
+    
+    with patch.object(manager, '_request_token', side_effect=request_token):
+        manager.start_auto_refresh()
+        await asyncio.wait_for(refreshed.wait(), 1)
+        await manager.cleanup()
+    
+    assert received == ["new_token"]
@@ -1,37 +1,102 @@
 import pytest
 import asyncio
+import aiohttp
 from unittest.mock import Mock, patch
-from websockets.exceptions import ConnectionClosed
 from src.core.websocket_manager import WebSocketManager
-import json
+import orjson
 from unittest.mock import AsyncMock
 
 @pytest.fixture
-def websocket_manager(test_logger, test_config):
+def mock_session():
+    return Mock()
+
+@pytest.fixture
+def websocket_manager(test_logger, test_config, mock_session):
+    http_client = Mock()
+    http_client.get_session = AsyncMock(return_value=mock_session)
     return WebSocketManager(
         url=test_config["base_url"],
-        token="test_token"
+        token="test_token",
+        http_client=http_client
     )
 
 @pytest.mark.asyncio
-async def test_connect_success(websocket_manager):
-    """웹소켓 연결 성공 테스트"""
-    with patch('websockets.connect') as mock_connect:
-        mock_ws = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_ws
-        
-        await websocket_manager.connect()
-        assert websocket_manager.ws == mock_ws
+async def test_run_success(websocket_manager, mock_session):
+    """웹소켓 연결 및 수신 성공 테스트"""
+    mock_ws = AsyncMock()
+    mock_ws.__aiter__.return_value = [
+        aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, "test_message", None),
+        aiohttp.WSMessage(aiohttp.WSMsgType.PONG, b"", None),
+    ]
+    mock_session.ws_connect.return_value.__aenter__ = AsyncMock(return_value=mock_ws)
+    mock_session.ws_connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    
+    with patch.object(websocket_manager, '_handle_reconnection', AsyncMock(return_value=False)):
+        await websocket_manager.run()
+    
+    assert websocket_manager.ws is None
+    assert websocket_manager.event_queue.get_nowait() == "test_message"
+    assert websocket_manager.event_queue.empty()
 
 @pytest.mark.asyncio
-async def test_connect_failure(websocket_manager):
+async def test_run_cancel_calls_shutdown_before_close(websocket_manager, mock_session):
+    """작업 취소 시 연결이 닫히기 전 종료 처리 호출 테스트"""
+    received = asyncio.Event()
+    async def messages():
+        yield aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, "test_message", None)
+        received.set()
+        await asyncio.Event().wait()
+    
+    mock_ws = AsyncMock()
+    mock_ws.__aiter__ = lambda self: messages()
+    mock_exit = AsyncMock(return_value=False)
+    mock_session.ws_connect.return_value.__aenter__ = AsyncMock(return_value=mock_ws)
+    mock_session.ws_connect.return_value.__aexit__ = mock_exit
+    
+    state = []
+    async def on_shutdown():
+        state.append((websocket_manager.ws is mock_ws, mock_exit.called))
+    websocket_manager.on_shutdown = AsyncMock(side_effect=on_shutdown)
+    
+    task = asyncio.create_task(websocket_manager.run())
+    await asyncio.wait_for(received.wait(), 1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    
+    websocket_manager.on_shutdown.assert_awaited_once()
+    assert state == [(True, False)]
+    mock_exit.assert_awaited_once()
+    assert websocket_manager.ws is None
+
+@pytest.mark.asyncio
+async def test_run_calls_reconnect_hook_only_after_reconnect(websocket_manager, mock_session):
+    """재연결 시에만 구독 복구 처리 호출 테스트"""
+    mock_ws = AsyncMock()
+    mock_ws.__aiter__.return_value = []
+    mock_session.ws_connect.return_value.__aenter__ = AsyncMock(return_value=mock_ws)
+    mock_session.ws_connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    websocket_manager.on_reconnect = AsyncMock()
+    
+    attempts = []
+    async def handle_reconnection():
+        websocket_manager.reconnect_count += 1
+        attempts.append(websocket_manager.on_reconnect.await_count)
+        return len(attempts) < 2
+    
+    with patch.object(websocket_manager, '_handle_reconnection', side_effect=handle_reconnection):
+        await websocket_manager.run()
+    
+    assert attempts == [0, 1]
+
+@pytest.mark.asyncio
+async def test_run_failure(websocket_manager, mock_session):
     """웹소켓 연결 실패 테스트"""
-    with patch('websockets.connect') as mock_connect:
-        mock_connect.side_effect = Exception("Connection failed")
-        
-        with patch.object(websocket_manager, '_handle_reconnection') as mock_reconnect:
-            await websocket_manager.connect()
-            mock_reconnect.assert_called_once()
+    mock_session.ws_connect.side_effect = Exception("Connection failed")
+    
+    with patch.object(websocket_manager, '_handle_reconnection', AsyncMock(return_value=False)) as mock_reconnect:
+        await websocket_manager.run()
+        mock_reconnect.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_send_message(websocket_manager):
@@ -42,20 +107,69 @@ async def test_send_message(websocket_manager):
     message = {"type": "test", "data": "test_data"}
     await websocket_manager.send(message)
     
-    mock_ws.send.assert_called_once_with(json.dumps(message))
+    mock_ws.send_str.assert_called_once_with(orjson.dumps(message).decode())
+
+@pytest.mark.asyncio
+async def test_send_raw_message(websocket_manager):
+    """직렬화된 메시지 전송 테스트"""
+    mock_ws = AsyncMock()
+    websocket_manager.ws = mock_ws
+    
+    message = '{"type":"test"}'
+    await websocket_manager.send_raw(message)
+    
+    mock_ws.send_str.assert_called_once_with(message)
+
+@pytest.mark.asyncio
+async def test_send_batch(websocket_manager):
+    """메시지 일괄 전송 테스트"""
+    mock_ws = AsyncMock()
+    websocket_manager.ws = mock_ws
+    
+    assert await websocket_manager.send_batch(['{"a":1}', '{"b":2}']) == 2
+    assert mock_ws.send_str.await_count == 2
+
+@pytest.mark.asyncio
+async def test_send_batch_reports_partial_send(websocket_manager):
+    """일괄 전송 중 오류 발생 시 전송한 메시지 수 반환 테스트"""
+    mock_ws = AsyncMock()
+    mock_ws.send_str.side_effect = [None, Exception("send failed"), None]
+    websocket_manager.ws = mock_ws
+    
+    assert await websocket_manager.send_batch(['{"a":1}', '{"b":2}', '{"c":3}']) == 1
 
 @pytest.mark.asyncio
 async def test_handle_reconnection(websocket_manager):
     """재연결 처리 테스트"""
-    with patch.object(websocket_manager, 'connect') as mock_connect:
-        await websocket_manager._handle_reconnection()
+    with patch('asyncio.sleep', AsyncMock()) as mock_sleep:
+        assert await websocket_manager._handle_reconnection()
         assert websocket_manager.reconnect_count == 1
-        mock_connect.assert_called_once()
+        mock_sleep.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_handle_reconnection_max_attempts(websocket_manager):
+    """최대 재연결 시도 횟수 초과 테스트"""
+    websocket_manager.reconnect_count = websocket_manager.max_reconnect_attempts
+    
+    assert not await websocket_manager._handle_reconnection()
+    assert not websocket_manager.is_running
 
-def test_cleanup(websocket_manager):
+@pytest.mark.asyncio
+async def test_cleanup(websocket_manager):
     """정리 작업 테스트"""
     mock_ws = AsyncMock()
     websocket_manager.ws = mock_ws
     
-    websocket_manager.cleanup()
-    assert not websocket_manager.is_running 
\ No newline at end of file
+    await websocket_manager.cleanup()
+    assert not websocket_manager.is_running
+    mock_ws.close.assert_awaited_once() 
+
+def test_enqueue_drops_oldest_when_full(websocket_manager):
+    """이벤트 큐 초과 시 가장 오래된 메시지 폐기 테스트"""
+    websocket_manager.event_queue = asyncio.Queue(maxsize=2)
+    
+    for message in ("first", "second", "third"):
+        websocket_manager._enqueue(message)
+    
+    assert websocket_manager.event_queue.get_nowait() == "second"
+    assert websocket_manager.event_queue.get_nowait() == "third"
@@ -160,4 +160,43 @@ async def test_process_message_exception(ccld_event_handler):
     ccld_event_handler.vi_handler.handle_vi_event.side_effect = Exception("테스트 예외")
     
     # 예외가 처리되어야 함
-    await ccld_event_handler.process_message(message) 
\ No newline at end of file
+    await ccld_event_handler.process_message(message) 
+
+@pytest.mark.asyncio
+async def test_process_message_prefilter_skips_parse(ccld_event_handler):
+    """처리 대상이 아닌 메시지는 파싱하지 않는지 테스트"""
+    message = json.dumps({
+        "header": {"tr_cd": "H1_"},
+        "body": {"shcode": "005930"}
+    })
+    
+    with patch('src.handlers.ccld_event_handler._json_loads') as mock_loads:
+        await ccld_event_handler.process_message(message)
+        mock_loads.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_process_message_bytes(ccld_event_handler):
+    """bytes 메시지 처리 테스트"""
+    message = json.dumps({
+        "header": {"tr_cd": "S3_"},
+        "body": {"shcode": "005930"}
+    }).encode()
+    
+    await ccld_event_handler.process_message(message)
+    ccld_event_handler.vi_handler.handle_trade_data.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_process_message_subscribe_response_with_tr_cd(ccld_event_handler):
+    """체결 tr_cd가 포함된 구독 응답 메시지 처리 테스트"""
+    message = json.dumps({
+        "header": {
+            "tr_cd": "S3_",
+            "tr_key": "005930",
+            "rsp_msg": "구독 성공",
+            "tr_type": "3"
+        }
+    })
+    
+    await ccld_event_handler.process_message(message)
+    ccld_event_handler.vi_handler.handle_trade_data.assert_not_called()
+    ccld_event_handler.vi_handler.data_manager.get_stock_info.assert_called_once_with("005930")
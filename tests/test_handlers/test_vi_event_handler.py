@@ -1,5 +1,6 @@
+import json
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
 from src.handlers.vi_event_handler import VIEventHandler
 
 @pytest.fixture
@@ -83,7 +84,33 @@ async def test_subscribe_trade_data(vi_event_handler):
     market_type = "S3_"
     
     await vi_event_handler.subscribe_trade_data(stock_code, market_type)
-    vi_event_handler.ws_manager.send.assert_called_once()
+    vi_event_handler.ws_manager.send_raw.assert_called_once()
+
+def test_build_message(vi_event_handler):
+    """구독 메시지 직렬화 테스트"""
+    vi_event_handler.ws_manager.token = "test_token"
+    
+    message = vi_event_handler._build_message("S3_", "3", "005930")
+    assert json.loads(message) == {
+        "header": {"token": "test_token", "tr_type": "3"},
+        "body": {"tr_cd": "S3_", "tr_key": "005930"}
+    }
+    assert json.loads(vi_event_handler._build_message("S3_", "3", "000660"))["body"]["tr_key"] == "000660"
+
+@pytest.mark.asyncio
+async def test_subscribe_after_token_refresh(vi_event_handler):
+    """토큰 갱신 후 구독 메시지의 새 토큰 사용 테스트"""
+    vi_event_handler.ws_manager.token = "old_token"
+    vi_event_handler.ws_manager.send_raw = AsyncMock()
+    vi_event_handler.data_manager.get_sorted_active_stocks.return_value = ["005930"]
+    await vi_event_handler.subscribe_trade_data("005930", "S3_")
+    
+    vi_event_handler.update_token("new_token")
+    await vi_event_handler.subscribe_trade_data("005930", "S3_")
+    
+    assert vi_event_handler.ws_manager.token == "new_token"
+    message = json.loads(vi_event_handler.ws_manager.send_raw.call_args[0][0])
+    assert message["header"]["token"] == "new_token"
 
 @pytest.mark.asyncio
 async def test_unsubscribe_trade_data(vi_event_handler):
@@ -92,7 +119,7 @@ async def test_unsubscribe_trade_data(vi_event_handler):
     market_type = "S3_"
     
     await vi_event_handler.unsubscribe_trade_data(stock_code, market_type)
-    vi_event_handler.ws_manager.send.assert_called_once()
+    vi_event_handler.ws_manager.send_raw.assert_called_once()
     vi_event_handler.data_manager.remove_vi_stock.assert_called_once_with(stock_code)
 
 @pytest.mark.asyncio
@@ -104,6 +131,20 @@ async def test_handle_reconnection(vi_event_handler):
     stock_info.market = "KOSPI"
     vi_event_handler.data_manager.get_stock_info.return_value = stock_info
     vi_event_handler.data_manager.get_active_stocks.return_value = ["005930"]
+    vi_event_handler.ws_manager.send_batch = AsyncMock(return_value=1)
     
     await vi_event_handler.handle_reconnection()
-    vi_event_handler.ws_manager.send.assert_called_once() 
\ No newline at end of file
+    vi_event_handler.ws_manager.send_batch.assert_called_once()
+    assert len(vi_event_handler.ws_manager.send_batch.call_args[0][0]) == 1
+
+@pytest.mark.asyncio
+async def test_cleanup(vi_event_handler):
+    """정리 작업 시 구독 해제 완료 대기 테스트"""
+    stock_info = Mock()
+    stock_info.tr_cd = "S3_"
+    vi_event_handler.data_manager.get_stock_info.return_value = stock_info
+    vi_event_handler.data_manager.get_active_stocks.return_value = ["005930", "000660"]
+    
+    with patch.object(VIEventHandler, 'unsubscribe_trade_data', AsyncMock()) as mock_unsubscribe:
+        await vi_event_handler.cleanup()
+        assert mock_unsubscribe.await_count == 2
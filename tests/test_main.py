@@ -5,7 +5,6 @@ from unittest.mock import Mock, patch, AsyncMock
 from src.main import VIMonitor, main
 from src.models.stock_info import StockInfo
 from datetime import datetime
-from config.constants import STOCK_INFO_DIR
 
 @pytest.fixture
 def sample_stock_data():
@@ -26,13 +25,19 @@ def sample_stock_data():
 def vi_monitor(test_logger):
     return VIMonitor()
 
+@pytest.fixture
+def stock_info_dir(tmp_path, monkeypatch):
+    """실제 종목 정보 디렉토리 대신 사용할 임시 디렉토리"""
+    monkeypatch.setattr('src.main.STOCK_INFO_PATH', tmp_path)
+    return tmp_path
+
 @pytest.mark.asyncio
 async def test_initialize(vi_monitor):
     """초기화 테스트"""
     with patch('src.core.token_manager.TokenManager.get_access_token') as mock_get_token:
         mock_get_token.return_value = "test_token"
         
-        with patch.object(vi_monitor, 'load_stock_info') as mock_load_info:
+        with patch.object(VIMonitor, 'load_stock_info') as mock_load_info:
             await vi_monitor.initialize()
             
             assert vi_monitor.ws_manager is not None
@@ -41,12 +46,11 @@ async def test_initialize(vi_monitor):
             mock_load_info.assert_called_once_with("test_token")
 
 @pytest.mark.asyncio
-async def test_load_stock_info_from_csv(vi_monitor):
+async def test_load_stock_info_from_csv(vi_monitor, stock_info_dir):
     """CSV 파일에서 종목 정보 로드 테스트"""
     # CSV 파일 생성
     today = datetime.now(vi_monitor.kst).strftime('%Y%m%d')
-    csv_file = os.path.join(STOCK_INFO_DIR, f'stocks_info_{today}.csv')
-    os.makedirs(STOCK_INFO_DIR, exist_ok=True)
+    csv_file = stock_info_dir / f'stocks_info_{today}.csv'
     
     with open(csv_file, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=['종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가'])
@@ -66,7 +70,7 @@ async def test_load_stock_info_from_csv(vi_monitor):
     assert '005930' in vi_monitor.data_manager.stock_info
 
 @pytest.mark.asyncio
-async def test_load_stock_info_from_api(vi_monitor):
+async def test_load_stock_info_from_api(vi_monitor, stock_info_dir):
     """API에서 종목 정보 로드 테스트"""
     with patch('aiohttp.ClientSession.post') as mock_post:
         mock_response = Mock()
@@ -89,7 +93,7 @@ async def test_load_stock_info_from_api(vi_monitor):
         assert '005930' in vi_monitor.data_manager.stock_info
 
 @pytest.mark.asyncio
-async def test_save_stock_info_to_csv(vi_monitor):
+async def test_save_stock_info_to_csv(vi_monitor, stock_info_dir):
     """종목 정보 CSV 파일 저장 테스트"""
     # 종목 정보 설정
     vi_monitor.data_manager.stock_info['005930'] = StockInfo(
@@ -104,23 +108,26 @@ async def test_save_stock_info_to_csv(vi_monitor):
     
     # CSV 파일 저장
     today = datetime.now(vi_monitor.kst).strftime('%Y%m%d')
-    csv_file = os.path.join(STOCK_INFO_DIR, f'stocks_info_{today}.csv')
+    csv_file = stock_info_dir / f'stocks_info_{today}.csv'
     vi_monitor.save_stock_info_to_csv(csv_file)
     
     # 파일 존재 확인
     assert os.path.exists(csv_file)
 
-def test_cleanup(vi_monitor):
+@pytest.mark.asyncio
+async def test_cleanup(vi_monitor):
     """정리 작업 테스트"""
     # 컴포넌트 모의 설정
     vi_monitor.vi_handler = Mock()
+    vi_monitor.vi_handler.cleanup = AsyncMock()
     vi_monitor.ws_manager = Mock()
+    vi_monitor.ws_manager.cleanup = AsyncMock()
     
-    vi_monitor.cleanup()
+    await vi_monitor.cleanup()
     
     assert not vi_monitor.is_running
-    vi_monitor.vi_handler.cleanup.assert_called_once()
-    vi_monitor.ws_manager.cleanup.assert_called_once()
+    vi_monitor.vi_handler.cleanup.assert_awaited_once()
+    vi_monitor.ws_manager.cleanup.assert_awaited_once()
 
 @pytest.mark.asyncio
 async def test_main_function():
@@ -138,4 +145,48 @@ async def test_main_function():
         # 함수 호출 확인
         mock_monitor.initialize.assert_called_once()
         mock_monitor.start.assert_called_once()
-        mock_monitor.cleanup.assert_called_once() 
\ No newline at end of file
+        mock_monitor.cleanup.assert_called_once() 
+
+@pytest.mark.asyncio
+async def test_load_stock_info_from_pickle(vi_monitor, stock_info_dir):
+    """캐시 파일에서 종목 정보 로드 테스트"""
+    vi_monitor.data_manager.stock_info['005930'] = StockInfo(
+        name='삼성전자',
+        market='KOSPI',
+        etf=False,
+        upper_limit=70000,
+        lower_limit=60000,
+        prev_close=65000,
+        base_price=65000
+    )
+    today = datetime.now(vi_monitor.kst).strftime('%Y%m%d')
+    csv_file = stock_info_dir / f'stocks_info_{today}.csv'
+    vi_monitor.save_stock_info_to_csv(csv_file)
+    assert os.path.exists(f'{csv_file}.pkl')
+    
+    vi_monitor.data_manager.stock_info = {}
+    with patch('src.main.csv.reader') as mock_reader:
+        await vi_monitor.load_stock_info("test_token")
+        mock_reader.assert_not_called()
+    assert vi_monitor.data_manager.stock_info['005930'].name == '삼성전자'
+
+@pytest.mark.asyncio
+async def test_load_stock_info_rejects_pickle_without_tr_cd(vi_monitor, stock_info_dir):
+    """체결 TR 코드가 없는 캐시 파일 대신 CSV 파일 사용 테스트"""
+    vi_monitor.data_manager.stock_info['005930'] = StockInfo(
+        name='삼성전자',
+        market='KOSPI',
+        etf=False,
+        upper_limit=70000,
+        lower_limit=60000,
+        prev_close=65000,
+        base_price=65000
+    )
+    # 체결 TR 코드가 빠진 채 저장된 이전 캐시 재현
+    object.__setattr__(vi_monitor.data_manager.stock_info['005930'], 'tr_cd', '')
+    today = datetime.now(vi_monitor.kst).strftime('%Y%m%d')
+    vi_monitor.save_stock_info_to_csv(stock_info_dir / f'stocks_info_{today}.csv')
+    
+    vi_monitor.data_manager.stock_info = {}
+    await vi_monitor.load_stock_info("test_token")
+    assert vi_monitor.data_manager.stock_info['005930'].tr_cd == 'S3_'
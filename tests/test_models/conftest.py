@@ -0,0 +1,29 @@
+import pytest
+from dataclasses import replace
+from src.models.stock_info import StockInfo
+
+# 종목 정보 fixture (불변 객체이므로 세션 전체에서 공유)
+@pytest.fixture(scope="session")
+def samsung_stock():
+    """삼성전자 종목 정보 fixture"""
+    return StockInfo(
+        name="삼성전자",
+        market="KOSPI",
+        etf=False,
+        upper_limit=70000,
+        lower_limit=60000,
+        prev_close=65000,
+        base_price=65000
+    )
+
+@pytest.fixture(scope="session")
+def sk_hynix_stock(samsung_stock):
+    """SK하이닉스 종목 정보 fixture (삼성전자 정보에서 다른 필드만 변경)"""
+    return replace(
+        samsung_stock,
+        name="SK하이닉스",
+        upper_limit=80000,
+        lower_limit=70000,
+        prev_close=75000,
+        base_price=75000
+    )
@@ -1,72 +1,52 @@
 import pytest
+from dataclasses import asdict, replace
 from src.models.stock_info import StockInfo
 
-def test_stock_info_creation():
-    """StockInfo 객체 생성 테스트"""
-    stock = StockInfo(
-        name="삼성전자",
-        market="KOSPI",
-        etf=False,
-        upper_limit=70000,
-        lower_limit=60000,
-        prev_close=65000,
-        base_price=65000
-    )
+# 병렬 실행 시 같은 워커에서 실행하여 세션 fixture 공유
+pytestmark = pytest.mark.xdist_group("models")
+
+# 삼성전자 종목 정보 필드 (생성 인자와 기대 문자열 표현의 기준)
+FIELDS = [("name", "삼성전자"), ("market", "KOSPI"), ("etf", False), ("upper_limit", 70000),
+          ("lower_limit", 60000), ("prev_close", 65000), ("base_price", 65000)]
+
+# 종목별 생성 인자 테이블
+CASES = [
+    ("samsung", dict(FIELDS)),
+    ("skhynix", dict(name="SK하이닉스", market="KOSPI", etf=False, upper_limit=80000,
+                     lower_limit=70000, prev_close=75000, base_price=75000)),
+]
+
+# 삼성전자 종목 정보의 기대 문자열 표현
+_SAMSUNG_REPR = "StockInfo(" + ", ".join(f"{key}={value!r}" for key, value in FIELDS) + ")"
+
+@pytest.mark.parametrize("kwargs", [case[1] for case in CASES], ids=[case[0] for case in CASES])
+def test_stock_info_roundtrip(kwargs):
+    """StockInfo 생성, 문자열 표현 복원 및 동등 비교 테스트"""
+    stock = StockInfo(**kwargs)
     
-    assert stock.name == "삼성전자"
-    assert stock.market == "KOSPI"
-    assert stock.etf is False
-    assert stock.upper_limit == 70000
-    assert stock.lower_limit == 60000
-    assert stock.prev_close == 65000
-    assert stock.base_price == 65000
+    assert asdict(stock) == dict(kwargs, tr_cd='S3_')  # tr_cd는 market에서 결정
+    assert eval(repr(stock)) == stock
+    assert StockInfo(**kwargs) == stock
 
 def test_stock_info_str_representation():
     """StockInfo 문자열 표현 테스트"""
-    stock = StockInfo(
-        name="삼성전자",
-        market="KOSPI",
-        etf=False,
-        upper_limit=70000,
-        lower_limit=60000,
-        prev_close=65000,
-        base_price=65000
-    )
-    
-    expected_str = "StockInfo(name='삼성전자', market='KOSPI', etf=False, upper_limit=70000, lower_limit=60000, prev_close=65000, base_price=65000)"
-    assert str(stock) == expected_str
+    assert str(StockInfo(**dict(FIELDS))) == _SAMSUNG_REPR
 
-def test_stock_info_equality():
+def test_stock_info_equality(samsung_stock, sk_hynix_stock):
     """StockInfo 객체 비교 테스트"""
-    stock1 = StockInfo(
-        name="삼성전자",
-        market="KOSPI",
-        etf=False,
-        upper_limit=70000,
-        lower_limit=60000,
-        prev_close=65000,
-        base_price=65000
-    )
-    
-    stock2 = StockInfo(
-        name="삼성전자",
-        market="KOSPI",
-        etf=False,
-        upper_limit=70000,
-        lower_limit=60000,
-        prev_close=65000,
-        base_price=65000
-    )
-    
-    stock3 = StockInfo(
-        name="SK하이닉스",
-        market="KOSPI",
-        etf=False,
-        upper_limit=80000,
-        lower_limit=70000,
-        prev_close=75000,
-        base_price=75000
-    )
-    
-    assert stock1 == stock2
-    assert stock1 != stock3 
\ No newline at end of file
+    assert replace(samsung_stock) == samsung_stock
+    assert samsung_stock != sk_hynix_stock
+
+def test_stock_info_is_frozen_and_slotted(samsung_stock):
+    """StockInfo 불변 및 __slots__ 사용 테스트"""
+    assert not hasattr(samsung_stock, '__dict__')
+    assert hash(samsung_stock) == hash(StockInfo(**CASES[0][1]))
+    with pytest.raises(AttributeError):
+        samsung_stock.name = "변경"
+
+@pytest.mark.parametrize("market, tr_cd", [("KOSPI", "S3_"), ("KOSDAQ", "K3_")])
+def test_stock_info_tr_cd_from_market(samsung_stock, market, tr_cd):
+    """시장 구분별 체결 TR 코드 결정 테스트"""
+    stock = replace(samsung_stock, market=market)
+    assert stock.tr_cd == tr_cd
+    assert (stock == samsung_stock) is (market == "KOSPI")
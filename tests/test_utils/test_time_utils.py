@@ -0,0 +1,44 @@
+from zoneinfo import ZoneInfo
+from datetime import datetime
+from unittest.mock import patch
+import src.utils.time_utils
+from src.utils.time_utils import hhmmss_now, yyyymmdd_now
+
+def test_hhmmss_now_format():
+    """현재 시각 포맷 테스트"""
+    kst = ZoneInfo('Asia/Seoul')
+    with patch('src.utils.time_utils.time.time', return_value=1700000000.5):
+        assert hhmmss_now(kst) == datetime.fromtimestamp(1700000000, kst).strftime('%H:%M:%S')
+
+def test_hhmmss_now_cached_within_second():
+    """같은 초 내 캐시 재사용 테스트"""
+    kst = ZoneInfo('Asia/Seoul')
+    with patch('src.utils.time_utils.time.time', side_effect=[1700000001.1, 1700000001.9]):
+        with patch('src.utils.time_utils.datetime') as mock_datetime:
+            mock_datetime.fromtimestamp.return_value.strftime.return_value = "07:13:21"
+            assert hhmmss_now(kst) == hhmmss_now(kst)
+            mock_datetime.fromtimestamp.assert_called_once()
+
+def test_hhmmss_now_cache_per_timezone():
+    """같은 초 내 다른 시간대 요청 시 캐시 미사용 테스트"""
+    kst = ZoneInfo('Asia/Seoul')
+    utc = ZoneInfo('UTC')
+    with patch('src.utils.time_utils.time.time', return_value=1700000002.5):
+        assert hhmmss_now(kst) == datetime.fromtimestamp(1700000002, kst).strftime('%H:%M:%S')
+        assert hhmmss_now(utc) == datetime.fromtimestamp(1700000002, utc).strftime('%H:%M:%S')
+
+def test_yyyymmdd_now_rolls_at_midnight():
+    """자정 이후 날짜 갱신 테스트"""
+    kst = ZoneInfo('Asia/Seoul')
+    before_midnight = datetime(2024, 1, 1, 23, 59, 59, tzinfo=kst)
+    after_midnight = datetime(2024, 1, 2, 0, 0, 1, tzinfo=kst)
+    
+    with patch('src.utils.time_utils.datetime') as mock_datetime:
+        mock_datetime.now.return_value = before_midnight
+        with patch('src.utils.time_utils.time.time', return_value=before_midnight.timestamp()):
+            src.utils.time_utils._yyyymmdd_cache[0] = 0.0
+            assert yyyymmdd_now(kst) == '20240101'
+        
+        mock_datetime.now.return_value = after_midnight
+        with patch('src.utils.time_utils.time.time', return_value=after_midnight.timestamp()):
+            assert yyyymmdd_now(kst) == '20240102'
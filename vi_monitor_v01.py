@@ -514,7 +514,7 @@ class VIMonitor:
             return
             
         # 현재 이벤트 루프 저장
-        self.event_loop = asyncio.get_event_loop()
+        self.event_loop = asyncio.get_running_loop()
             
         # 웹소켓 연결 시 헤더 설정
         websocket_headers = {
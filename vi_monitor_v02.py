@@ -1,18 +1,68 @@
 import os
 import json
+import time
+import orjson
 import asyncio
-import websocket
+import bisect
+import heapq
+import websockets
 import aiohttp
 from datetime import datetime, timedelta
 import pytz
 from dotenv import load_dotenv, set_key
 import csv
+import pickle
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 
 # 환경 변수 로드
 load_dotenv()
 
+# VI 전체 종목 실시간 등록 요청 (tr_type 3: 실시간 시세 등록, tr_key 000000: 전체 종목)
+VI_SUBSCRIBE_TEMPLATE = '{"header":{"token":"%s","tr_type":"3"},"body":{"tr_cd":"VI_","tr_key":"000000"}}'
+
+# VI 구분 코드별 상태명
+VI_STATUS = {
+    "0": "해제",
+    "1": "정적발동",
+    "2": "동적발동",
+    "3": "정적&동적"
+}
+VI_ACTIVE_GUBUN = frozenset(("1", "2", "3"))  # 체결 정보를 구독할 VI 발동 구분
+
+@dataclass(slots=True, frozen=True)
+class StockInfo:
+    """종목 정보"""
+    name: str
+    market: str
+    tr_cd: str  # 체결 정보 TR 코드
+    etf: bool
+    upper_limit: int
+    lower_limit: int
+    prev_close: int
+    base_price: int
+
+# 종목 정보가 없을 때 사용하는 기본값
+UNKNOWN_STOCK = StockInfo('알 수 없음', 'KOSPI', 'S3_', False, 0, 0, 0, 0)
+
+@lru_cache(maxsize=4096)
+def build_trade_message(token, tr_type, tr_cd, stock_code):
+    """체결 정보 구독/해제 메시지 직렬화 (같은 토큰/종목 조합은 캐시 사용)"""
+    # 서버는 텍스트 프레임을 기대하므로 bytes 결과를 str로 변환
+    return orjson.dumps({
+        "header": {
+            "token": token,
+            "tr_type": tr_type  # 3: 실시간 시세 등록, 4: 실시간 시세 해제
+        },
+        "body": {
+            "tr_cd": tr_cd,  # KOSPI 또는 KOSDAQ 체결 정보
+            "tr_key": stock_code
+        }
+    }).decode()
+
 class VIEventHandler:
     """VI 이벤트 처리 및 체결 구독 관리 클래스"""
     def __init__(self, token, ws, kst, stock_info):
@@ -22,91 +72,126 @@ class VIEventHandler:
         self.stock_info = stock_info
         self.vi_active_stocks = {}  # VI 발동된 종목 코드와 발동 시각 저장
         self.unsubscribed_stocks = {}  # 해지 완료된 종목 정보 저장
-        self.event_loop = None  # 이벤트 루프 저장
-        self.is_reconnecting = False  # 재연결 중 여부
+        self._expiry_heap = []  # (구독 해제 예정 monotonic 시각, 종목코드) 힙
+        self._expiry_deadlines = {}  # 종목코드별 현재 유효한 구독 해제 예정 시각
+        self._expiry_wake = asyncio.Event()  # 힙 변경 시 타이머 작업 깨우기
+        self._expiry_task = None  # 3분 구독 해제 타이머 작업 (단일 태스크)
+        self._reconnect_lock = asyncio.Lock()  # 재연결 재구독 중복 실행 방지
+        self._active_sorted = []  # 정렬된 구독 종목 코드 (추가/삭제 시 정렬 유지)
+        self._active_display = ''  # 로그 출력용 구독 종목 목록 문자열
+        self._ts_epoch = 0  # 캐시된 시각 문자열의 기준 epoch 초
+        self._ts_str = ''  # 초 단위로 캐시한 "%H:%M:%S" 문자열
         
         # 로거 설정
-        self.logger = logging.getLogger('VIEventHandler')
-        
-    def log_and_print(self, message, level='info'):
-        """로그 출력 및 저장"""
-        if level == 'info':
-            self.logger.info(message)
-        elif level == 'error':
-            self.logger.error(message)
-        elif level == 'warning':
-            self.logger.warning(message)
-        elif level == 'debug':
-            self.logger.debug(message)
-
-    def get_tr_cd(self, market_type):
-        """시장 구분을 tr_cd로 변환"""
-        return "S3_" if market_type == "KOSPI" else "K3_" if market_type == "KOSDAQ" else market_type
-
-    def handle_vi_event(self, vi_data):
+        self.logger = logging.getLogger('VIMonitor.VIEventHandler')
+        self.log = self.logger.info
+        self.log_warn = self.logger.warning
+        self.log_err = self.logger.error
+        
+    def get_timestamp(self):
+        """현재 시각 문자열 반환 (초가 바뀔 때만 다시 포맷팅)"""
+        sec = int(time.time())
+        if sec != self._ts_epoch:
+            self._ts_epoch = sec
+            self._ts_str = datetime.fromtimestamp(sec, self.kst).strftime("%H:%M:%S")
+        return self._ts_str
+
+    async def handle_vi_event(self, vi_data):
         """VI 이벤트 처리"""
         body = vi_data.get("body", {})
-        current_time = datetime.now(self.kst)
-        timestamp = current_time.strftime("%H:%M:%S")
+        timestamp = self.get_timestamp()
         
         vi_gubun = body.get("vi_gubun", "0")
-        vi_status = {
-            "0": "해제",
-            "1": "정적발동",
-            "2": "동적발동",
-            "3": "정적&동적"
-        }.get(vi_gubun, "알 수 없음")
+        vi_status = VI_STATUS.get(vi_gubun, "알 수 없음")
         
         stock_code = body.get('ref_shcode')
-        stock_info = self.stock_info.get(stock_code, {})
-        market_type = stock_info.get('market', 'KOSPI')
-        tr_cd = self.get_tr_cd(market_type)
-        stock_name = stock_info.get('name', '알 수 없음')
+        stock_info = self.stock_info.get(stock_code, UNKNOWN_STOCK)
+        market_type = stock_info.market
+        tr_cd = stock_info.tr_cd
+        stock_name = stock_info.name
         
-        # VI 상태 정보를 한 줄로 출력
-        vi_message = f"[{timestamp}] [VI {vi_status}] {market_type} | {stock_name}({stock_code}) | 기준가: {body.get('vi_trgprice')} | 발동시각: {body.get('time')}"
-        self.log_and_print(vi_message)
+        # VI 상태 정보를 한 줄로 출력 (출력되지 않는 레벨이면 포맷팅 생략)
+        self.logger.info("[%s] [VI %s] %s | %s(%s) | 기준가: %s | 발동시각: %s",
+                         timestamp, vi_status, market_type, stock_name, stock_code,
+                         body.get('vi_trgprice'), body.get('time'))
         
         # VI 발동된 경우 체결 정보 구독
-        if vi_gubun in ["1", "2", "3"] and stock_code not in self.vi_active_stocks:
-            self.vi_active_stocks[stock_code] = current_time
-            self.subscribe_trade_data(stock_code, tr_cd)
+        if vi_gubun in VI_ACTIVE_GUBUN and stock_code not in self.vi_active_stocks:
+            self.vi_active_stocks[stock_code] = datetime.now(self.kst)
+            bisect.insort(self._active_sorted, stock_code)
+            self._active_display = ', '.join(self._active_sorted)
+            await self.subscribe_trade_data(stock_code, tr_cd)
             sub_message = f">>> {market_type} {stock_name}({stock_code}) 종목 체결 정보 구독 시작"
-            self.log_and_print(sub_message)
+            self.log(sub_message)
             
-            # 3분 후 자동 구독 취소를 위한 타이머 시작
-            if self.event_loop:
-                asyncio.run_coroutine_threadsafe(
-                    self.delayed_unsubscribe_after_3min(stock_code, market_type, stock_name),
-                    self.event_loop
-                )
-            else:
-                self.log_and_print("이벤트 루프가 설정되지 않았습니다.", level='error')
+            # 3분 후 자동 구독 취소 예약 (단일 타이머 작업이 힙 순서대로 처리)
+            self.schedule_unsubscribe(stock_code, market_type, stock_name)
 
-    def handle_trade_data(self, trade_data, market_type):
+    async def handle_trade_data(self, trade_data, market_type):
         """체결 데이터 처리"""
+        # 체결 정보는 출력만 하므로 INFO 로그가 꺼져 있으면 바로 종료
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         body = trade_data.get("body", {})
         stock_code = body.get("shcode")
-        current_time = datetime.now(self.kst)
-        timestamp = current_time.strftime("%H:%M:%S")
         
         # 구독된 종목의 체결 정보만 출력
         if stock_code in self.vi_active_stocks:
-            stock_info = self.stock_info.get(stock_code, {})
-            stock_name = stock_info.get('name', '알 수 없음')
+            timestamp = self.get_timestamp()
+            stock_name = self.stock_info.get(stock_code, UNKNOWN_STOCK).name
             
             # 체결 정보를 간단하게 출력
-            trade_message = f"[{timestamp}] 체결 | {stock_name}({stock_code}) | {body.get('price'):>7}원 | {body.get('cvolume'):>6}주"
-            self.log_and_print(trade_message)
+            self.logger.info("[%s] 체결 | %s(%s) | %7s원 | %6s주",
+                             timestamp, stock_name, stock_code, body.get('price'), body.get('cvolume'))
 
-    async def delayed_unsubscribe_after_3min(self, stock_code, market_type, stock_name):
-        """3분 후에 구독 취소"""
-        try:
-            self.log_and_print(f">>> {market_type} {stock_name}({stock_code}) 종목 3분 타이머 시작")
-            await asyncio.sleep(180)  # 3분 대기
+    def schedule_unsubscribe(self, stock_code, market_type, stock_name):
+        """3분 후 구독 취소 예약"""
+        deadline = time.monotonic() + 180  # 3분 후
+        self._expiry_deadlines[stock_code] = deadline
+        heapq.heappush(self._expiry_heap, (deadline, stock_code))
+        self.log(f">>> {market_type} {stock_name}({stock_code}) 종목 3분 타이머 시작")
+        
+        if self._expiry_task is None or self._expiry_task.done():
+            self._expiry_task = asyncio.create_task(self._expiry_worker())
+        else:
+            self._expiry_wake.set()
+
+    async def _expiry_worker(self):
+        """가장 먼저 만료되는 종목까지 대기한 뒤 구독 취소"""
+        heap = self._expiry_heap
+        while True:
+            if not heap:
+                await self._expiry_wake.wait()
+                self._expiry_wake.clear()
+                continue
+            
+            deadline, stock_code = heap[0]
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                # 새 예약이 들어오면 깨어나서 힙의 맨 앞을 다시 확인
+                self._expiry_wake.clear()
+                try:
+                    await asyncio.wait_for(self._expiry_wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
             
+            heapq.heappop(heap)
+            # 취소되었거나 다시 예약된 항목은 건너뜀
+            if self._expiry_deadlines.get(stock_code) != deadline:
+                continue
+            del self._expiry_deadlines[stock_code]
+            await self.unsubscribe_expired(stock_code)
+
+    async def unsubscribe_expired(self, stock_code):
+        """3분이 지난 종목의 구독 취소"""
+        stock_info = self.stock_info.get(stock_code, UNKNOWN_STOCK)
+        market_type = stock_info.market
+        stock_name = stock_info.name
+        try:
             if stock_code in self.vi_active_stocks:
-                self.log_and_print(f">>> {market_type} {stock_name}({stock_code}) 종목 3분 경과")
+                self.log(f">>> {market_type} {stock_name}({stock_code}) 종목 3분 경과")
                 
                 # 해지 완료 정보 저장
                 activation_time = self.vi_active_stocks[stock_code]
@@ -118,99 +203,86 @@ class VIEventHandler:
                 
                 # 활성 목록에서 제거
                 del self.vi_active_stocks[stock_code]
-                tr_cd = self.get_tr_cd(market_type)
-                self.unsubscribe_trade_data(stock_code, tr_cd)
+                self._active_sorted.remove(stock_code)
+                self._active_display = ', '.join(self._active_sorted)
+                await self.unsubscribe_trade_data(stock_code, stock_info.tr_cd)
                 
                 unsub_message = f">>> {market_type} {stock_name}({stock_code}) 종목 체결 정보 구독 해제 (3분 경과)"
-                self.log_and_print(unsub_message)
+                self.log(unsub_message)
             else:
-                self.log_and_print(f">>> {market_type} {stock_name}({stock_code}) 종목은 이미 구독이 취소되었습니다.")
+                self.log(f">>> {market_type} {stock_name}({stock_code}) 종목은 이미 구독이 취소되었습니다.")
         except Exception as e:
-            self.log_and_print(f"구독 취소 지연 처리 중 오류 발생: {e}", level='error')
+            self.log_err(f"구독 취소 지연 처리 중 오류 발생: {e}")
 
-    def update_websocket(self, ws):
+    async def update_websocket(self, ws):
         """웹소켓 객체 업데이트"""
         if ws is None:
-            self.log_and_print("웹소켓 객체가 None입니다.", level='error')
+            self.log_err("웹소켓 객체가 None입니다.")
             return False
             
         try:
-            self.ws = ws
-            self.is_reconnecting = True
-            
-            # 재연결 시 활성화된 VI 종목들의 체결 정보 재구독
-            for stock_code in list(self.vi_active_stocks.keys()):
-                stock_info = self.stock_info.get(stock_code, {})
-                market_type = stock_info.get('market', 'KOSPI')
-                tr_cd = self.get_tr_cd(market_type)
-                self.subscribe_trade_data(stock_code, tr_cd)
+            async with self._reconnect_lock:
+                self.ws = ws
                 
-            self.is_reconnecting = False
+                # 재연결 시 활성화된 VI 종목들의 체결 정보 재구독 (요청을 모아 한 번에 전송)
+                if self.vi_active_stocks:
+                    start = time.perf_counter()
+                    payloads = [
+                        build_trade_message(self.token, "3", self.stock_info.get(stock_code, UNKNOWN_STOCK).tr_cd, stock_code)
+                        for stock_code in self.vi_active_stocks
+                    ]
+                    await asyncio.gather(*(ws.send(payload) for payload in payloads))
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    self.log(f">>> 재연결 후 {len(payloads)}개 종목 재구독 완료 ({elapsed_ms:.1f}ms)")
+                    
             return True
         except Exception as e:
-            self.log_and_print(f"웹소켓 업데이트 중 오류 발생: {e}", level='error')
-            self.is_reconnecting = False
+            self.log_err(f"웹소켓 업데이트 중 오류 발생: {e}")
             return False
 
-    def subscribe_trade_data(self, stock_code, market_type):
+    async def subscribe_trade_data(self, stock_code, market_type):
         """체결 정보 구독"""
         if self.ws is None:
-            self.log_and_print(f"웹소켓 연결이 없습니다. {stock_code} 종목 구독을 건너뜁니다.", level='error')
+            self.log_err(f"웹소켓 연결이 없습니다. {stock_code} 종목 구독을 건너뜁니다.")
             return
             
         try:
-            subscribe_message = {
-                "header": {
-                    "token": self.token,
-                    "tr_type": "3"  # 실시간 시세 등록
-                },
-                "body": {
-                    "tr_cd": market_type,  # KOSPI 또는 KOSDAQ 체결 정보
-                    "tr_key": stock_code
-                }
-            }
-            
-            self.ws.send(json.dumps(subscribe_message))
-            if not self.is_reconnecting:
-                self.log_and_print(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({', '.join(sorted(self.vi_active_stocks))})")
+            await self.ws.send(build_trade_message(self.token, "3", market_type, stock_code))
+            self.log(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({self._active_display})")
         except Exception as e:
-            self.log_and_print(f"구독 요청 중 오류 발생: {e}", level='error')
+            self.log_err(f"구독 요청 중 오류 발생: {e}")
 
-    def unsubscribe_trade_data(self, stock_code, market_type):
+    async def unsubscribe_trade_data(self, stock_code, market_type):
         """체결 정보 구독 해제"""
         if self.ws is None:
-            self.log_and_print(f"웹소켓 연결이 없습니다. {stock_code} 종목 구독 해제를 건너뜁니다.", level='error')
+            self.log_err(f"웹소켓 연결이 없습니다. {stock_code} 종목 구독 해제를 건너뜁니다.")
             return
             
         try:
-            unsubscribe_message = {
-                "header": {
-                    "token": self.token,
-                    "tr_type": "4"  # 실시간 시세 해제
-                },
-                "body": {
-                    "tr_cd": market_type,  # KOSPI 또는 KOSDAQ 체결 정보
-                    "tr_key": stock_code
-                }
-            }
-            
-            self.ws.send(json.dumps(unsubscribe_message))
-            if not self.is_reconnecting:
-                self.log_and_print(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({', '.join(sorted(self.vi_active_stocks))})")
+            await self.ws.send(build_trade_message(self.token, "4", market_type, stock_code))
+            self.log(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({self._active_display})")
         except Exception as e:
-            self.log_and_print(f"구독 해제 요청 중 오류 발생: {e}", level='error')
+            self.log_err(f"구독 해제 요청 중 오류 발생: {e}")
 
-    def cleanup(self):
+    async def cleanup(self):
         """프로그램 종료 시 정리 작업"""
-        self.log_and_print("구독 정리 작업 시작...")
-        
-        # VI 발동된 모든 종목의 체결 정보 구독 해제
-        for stock_code in list(self.vi_active_stocks.keys()):
-            market_type = self.stock_info.get(stock_code, {}).get('market', 'KOSPI')
-            tr_cd = self.get_tr_cd(market_type)
-            self.unsubscribe_trade_data(stock_code, tr_cd)
-        
-        self.log_and_print("구독 정리 작업 완료")
+        self.log("구독 정리 작업 시작...")
+        
+        # 대기 중인 3분 타이머 취소
+        if self._expiry_task:
+            self._expiry_task.cancel()
+        self._expiry_heap.clear()
+        self._expiry_deadlines.clear()
+        
+        # VI 발동된 모든 종목의 체결 정보 구독 해제 (타이머 취소 후라 순회 중 변경 없음)
+        for stock_code in self.vi_active_stocks:
+            tr_cd = self.stock_info.get(stock_code, UNKNOWN_STOCK).tr_cd
+            await self.unsubscribe_trade_data(stock_code, tr_cd)
+        self.vi_active_stocks.clear()
+        self._active_sorted.clear()
+        self._active_display = ''
+        
+        self.log("구독 정리 작업 완료")
 
 class TokenManager:
     """토큰 관리 클래스"""
@@ -223,19 +295,11 @@ class TokenManager:
         self.kst = kst
         
         # 로거 설정
-        self.logger = logging.getLogger('TokenManager')
-        
-    def log_and_print(self, message, level='info'):
-        """로그 출력 및 저장"""
-        if level == 'info':
-            self.logger.info(message)
-        elif level == 'error':
-            self.logger.error(message)
-        elif level == 'warning':
-            self.logger.warning(message)
-        elif level == 'debug':
-            self.logger.debug(message)
-
+        self.logger = logging.getLogger('VIMonitor.TokenManager')
+        self.log = self.logger.info
+        self.log_warn = self.logger.warning
+        self.log_err = self.logger.error
+        
     def save_token_to_env(self, token, expires_in):
         """토큰 정보를 .env 파일에 저장"""
         current_time = datetime.now(self.kst)
@@ -247,10 +311,15 @@ class TokenManager:
         
         self.token = token
         self.token_expires_at = expires_at
-        self.log_and_print(f"토큰 정보가 .env 파일에 저장되었습니다. (만료일시: {expires_at.strftime('%Y-%m-%d %H:%M:%S %Z')})")
+        build_trade_message.cache_clear()  # 이전 토큰으로 만든 메시지 폐기
+        self.log(f"토큰 정보가 .env 파일에 저장되었습니다. (만료일시: {expires_at.strftime('%Y-%m-%d %H:%M:%S %Z')})")
     
     def is_token_valid(self):
         """저장된 토큰의 유효성 검사"""
+        # 이미 읽어 둔 토큰이 있으면 .env 재조회 없이 만료 시각만 확인
+        if self.token is not None and self.token_expires_at is not None:
+            return self.token_expires_at - timedelta(minutes=5) > datetime.now(self.kst)
+        
         saved_token = os.getenv('LS_ACCESS_TOKEN')
         saved_expires_at = os.getenv('LS_TOKEN_EXPIRES_AT')
         
@@ -276,14 +345,14 @@ class TokenManager:
             self.token_expires_at = expires_at
             return True
         except Exception as e:
-            self.log_and_print(f"토큰 유효성 검사 중 오류 발생: {e}")
+            self.log(f"토큰 유효성 검사 중 오류 발생: {e}")
             return False
         
     async def get_access_token(self):
         """접근 토큰 발급"""
         # 저장된 토큰이 유효한지 확인
         if self.is_token_valid():
-            self.log_and_print("유효한 토큰이 이미 저장되어 있습니다.")
+            self.log("유효한 토큰이 이미 저장되어 있습니다.")
             return self.token
             
         headers = {
@@ -297,17 +366,17 @@ class TokenManager:
             "scope": "oob"
         }
         
-        self.log_and_print("\n토큰 발급 요청 정보:")
-        self.log_and_print(f"URL: {self.token_url}")
-        self.log_and_print(f"Headers: {headers}")
-        self.log_and_print(f"Data: {data}")
+        self.log("\n토큰 발급 요청 정보:")
+        self.log(f"URL: {self.token_url}")
+        self.log(f"Headers: {headers}")
+        self.log(f"Data: {data}")
         
         async with aiohttp.ClientSession() as session:
             try:
                 async with session.post(self.token_url, headers=headers, data=data) as response:
-                    self.log_and_print(f"\n응답 상태 코드: {response.status}")
+                    self.log(f"\n응답 상태 코드: {response.status}")
                     result = await response.json()
-                    self.log_and_print(f"응답 데이터: {json.dumps(result, indent=2)}")
+                    self.log(f"응답 데이터: {json.dumps(result, indent=2)}")
                     
                     if response.status == 200:
                         token = result.get("access_token")
@@ -315,11 +384,11 @@ class TokenManager:
                         self.save_token_to_env(token, expires_in)
                         return token
                     else:
-                        self.log_and_print(f"\n토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}")
+                        self.log(f"\n토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}")
                         raise Exception(f"토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}")
                         
             except Exception as e:
-                self.log_and_print(f"\n토큰 발급 중 오류 발생: {str(e)}")
+                self.log(f"\n토큰 발급 중 오류 발생: {str(e)}")
                 raise
 
 class VIMonitor:
@@ -333,10 +402,11 @@ class VIMonitor:
         self.is_running = True  # 프로그램 실행 상태 플래그
         self.stock_info = {}  # 종목 정보 저장
         self.event_handler = None  # VI 이벤트 핸들러
-        self.reconnect_delay = 5  # 재연결 대기 시간 (초)
+        self._tr_handlers = {}  # tr_cd별 메시지 처리 메서드
+        self.reconnect_delay = 5  # 재연결 대기 시간 (초, 시도마다 2배씩 증가)
+        self.max_reconnect_delay = 60  # 최대 재연결 대기 시간 (초)
         self.max_reconnect_attempts = 5  # 최대 재연결 시도 횟수
         self.reconnect_count = 0  # 현재 재연결 시도 횟수
-        self.is_reconnecting = False  # 재연결 중 여부
         
         # 토큰 매니저 초기화
         self.token_manager = TokenManager(self.api_key, self.api_secret, self.kst)
@@ -347,62 +417,81 @@ class VIMonitor:
 
     def setup_logger(self):
         """로거 설정"""
-        today = datetime.now(self.kst).strftime('%Y%m%d')
-        log_file = f'log_{today}.txt'
+        # 한국 시간 자정을 시스템 로컬 시각으로 변환한 교체 시각
+        kst_midnight = datetime.now(self.kst).replace(hour=0, minute=0, second=0, microsecond=0)
+        rollover_time = kst_midnight.astimezone().time()
         
         # 로거 생성
         self.logger = logging.getLogger('VIMonitor')
         self.logger.setLevel(logging.INFO)
+        self.log = self.logger.info
+        self.log_warn = self.logger.warning
+        self.log_err = self.logger.error
         
         # 포맷터 생성
         formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
         
-        # 파일 핸들러 생성 (10MB 크기 제한, 최대 5개 파일 백업)
-        file_handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5, encoding='utf-8')
+        # 파일 핸들러 생성 (한국 시간 자정마다 교체, 최대 30일 보관)
+        file_handler = TimedRotatingFileHandler('log.txt', when='midnight', atTime=rollover_time,
+                                                backupCount=30, encoding='utf-8', utc=False)
         file_handler.setFormatter(formatter)
+        file_handler.setLevel(logging.INFO)
         
-        # 콘솔 핸들러 생성
+        # 콘솔 핸들러 생성 (경고 이상만 출력)
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
+        console_handler.setLevel(logging.WARNING)
         
-        # 핸들러 추가
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # 파일/콘솔 출력은 리스너 스레드에서 처리하고 로거는 큐에 넣기만 함
+        log_queue = queue.Queue(-1)
+        self.logger.addHandler(QueueHandler(log_queue))
+        self.log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        self.log_listener.start()
         
         self.logger.info("VI 모니터링 프로그램이 시작되었습니다.")
 
-    def log_and_print(self, message, level='info'):
-        """로그 출력 및 저장"""
-        if level == 'info':
-            self.logger.info(message)
-        elif level == 'error':
-            self.logger.error(message)
-        elif level == 'warning':
-            self.logger.warning(message)
-        elif level == 'debug':
-            self.logger.debug(message)
-
     async def get_stock_info(self):
         """전체 종목 정보 조회"""
         # 오늘 날짜로 파일명 생성 (YYYYMMDD 형식)
         today = datetime.now(self.kst).strftime('%Y%m%d')
         csv_file = f'stocks_info_{today}.csv'
+        pickle_file = f'stocks_info_{today}.pkl'
+
+        # CSV 파싱 없이 바로 복원 가능한 스냅샷 파일 우선 사용
+        try:
+            with open(pickle_file, 'rb') as f:
+                self.stock_info = pickle.load(f)
+            self.log(f"오늘({today}) 저장된 종목 정보 스냅샷 파일을 불러옵니다.")
+            return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log_warn(f"종목 정보 스냅샷 파일 로드 실패, CSV 파일을 사용합니다: {e}")
 
         if os.path.exists(csv_file):
-            self.log_and_print(f"오늘({today}) 저장된 종목 정보 파일을 불러옵니다.")
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            self.log(f"오늘({today}) 저장된 종목 정보 파일을 불러옵니다.")
+            with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                # 저장할 때와 같은 열 순서로 읽음 (체결TR 열이 없는 이전 형식 파일은 시장구분으로 결정)
+                has_tr_cd = '체결TR' in next(reader)
                 for row in reader:
-                    # CSV에서 읽은 문자열 값을 적절한 타입으로 변환
-                    self.stock_info[row['종목코드']] = {
-                        'name': row['종목명'],
-                        'market': row['시장구분'],
-                        'etf': row['ETF구분'] == 'True',
-                        'upper_limit': int(row['상한가']),
-                        'lower_limit': int(row['하한가']),
-                        'prev_close': int(row['전일가']),
-                        'base_price': int(row['기준가'])
-                    }
+                    if has_tr_cd:
+                        code, name, market, tr_cd, etf, upper, lower, prev, base = row
+                    else:
+                        code, name, market, etf, upper, lower, prev, base = row
+                        tr_cd = "S3_" if market == "KOSPI" else "K3_"
+                    self.stock_info[code] = StockInfo(
+                        name=name,
+                        market=market,
+                        tr_cd=tr_cd,
+                        etf=etf == 'True',
+                        upper_limit=int(upper),
+                        lower_limit=int(lower),
+                        prev_close=int(prev),
+                        base_price=int(base)
+                    )
+            with open(pickle_file, 'wb') as f:
+                pickle.dump(self.stock_info, f, protocol=5)
             return
 
         # 종목 정보 조회 URL
@@ -428,7 +517,7 @@ class VIMonitor:
         async with aiohttp.ClientSession() as session:
             try:
                 async with session.post(url, headers=headers, json=request_data) as response:
-                    self.log_and_print(f"\n종목 정보 조회 응답 상태: {response.status}")
+                    self.log(f"\n종목 정보 조회 응답 상태: {response.status}")
                     if response.status == 200:
                         result = await response.json()
                         stock_list = result.get("t8430OutBlock", [])
@@ -436,200 +525,140 @@ class VIMonitor:
                         # 종목 정보 저장
                         for stock in stock_list:
                             market = "KOSPI" if stock["gubun"] == "1" else "KOSDAQ"
-                            self.stock_info[stock["shcode"]] = {
-                                "name": stock["hname"],
-                                "market": market,
-                                "etf": stock["etfgubun"] == "1",
-                                "upper_limit": stock["uplmtprice"],
-                                "lower_limit": stock["dnlmtprice"],
-                                "prev_close": stock["jnilclose"],
-                                "base_price": stock["recprice"]
-                            }
+                            self.stock_info[stock["shcode"]] = StockInfo(
+                                name=stock["hname"],
+                                market=market,
+                                tr_cd="S3_" if market == "KOSPI" else "K3_",
+                                etf=stock["etfgubun"] == "1",
+                                upper_limit=stock["uplmtprice"],
+                                lower_limit=stock["dnlmtprice"],
+                                prev_close=stock["jnilclose"],
+                                base_price=stock["recprice"]
+                            )
                         
                         # 종목 정보를 CSV 파일로 저장
                         with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-                            fieldnames = ['종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가']
-                            writer = csv.DictWriter(f, fieldnames=fieldnames)
-                            writer.writeheader()
-                            
-                            for code, info in self.stock_info.items():
-                                writer.writerow({
-                                    '종목코드': code,
-                                    '종목명': info['name'],
-                                    '시장구분': info['market'],
-                                    'ETF구분': info['etf'],
-                                    '상한가': info['upper_limit'],
-                                    '하한가': info['lower_limit'],
-                                    '전일가': info['prev_close'],
-                                    '기준가': info['base_price']
-                                })
+                            writer = csv.writer(f)
+                            writer.writerow(('종목코드', '종목명', '시장구분', '체결TR', 'ETF구분', '상한가', '하한가', '전일가', '기준가'))
+                            writer.writerows(
+                                (code, info.name, info.market, info.tr_cd, info.etf,
+                                 info.upper_limit, info.lower_limit, info.prev_close, info.base_price)
+                                for code, info in self.stock_info.items()
+                            )
+                        
+                        # 다음 실행 시 CSV 파싱을 건너뛰기 위한 스냅샷 저장 (CSV는 확인용으로 유지)
+                        with open(pickle_file, 'wb') as f:
+                            pickle.dump(self.stock_info, f, protocol=5)
                         
-                        self.log_and_print(f"전체 {len(self.stock_info)}개 종목 정보를 CSV 파일로 저장했습니다.")
-                        self.log_and_print(f"- KOSPI: {sum(1 for info in self.stock_info.values() if info['market'] == 'KOSPI')}개")
-                        self.log_and_print(f"- KOSDAQ: {sum(1 for info in self.stock_info.values() if info['market'] == 'KOSDAQ')}개")
+                        self.log(f"전체 {len(self.stock_info)}개 종목 정보를 CSV 파일로 저장했습니다.")
+                        self.log(f"- KOSPI: {sum(1 for info in self.stock_info.values() if info.market == 'KOSPI')}개")
+                        self.log(f"- KOSDAQ: {sum(1 for info in self.stock_info.values() if info.market == 'KOSDAQ')}개")
                     else:
-                        self.log_and_print(f"종목 정보 조회 실패: {response.status}")
+                        self.log(f"종목 정보 조회 실패: {response.status}")
                         error_text = await response.text()
-                        self.log_and_print(f"에러 응답: {error_text}")
+                        self.log(f"에러 응답: {error_text}")
                         raise Exception(f"종목 정보 조회 실패: {response.status}")
                         
             except Exception as e:
-                self.log_and_print(f"종목 정보 조회 중 오류 발생: {e}")
+                self.log(f"종목 정보 조회 중 오류 발생: {e}")
                 raise
 
     async def create_websocket(self):
-        """웹소켓 객체 생성"""
+        """웹소켓 연결 및 수신 루프 (연결이 종료되면 반환)"""
         websocket_headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
         
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                self.log_and_print(f"메시지 수신: {message}")
-                
-                # 헤더와 바디가 있는지 확인
-                if not isinstance(data, dict):
-                    self.log_and_print("잘못된 메시지 형식입니다.")
-                    return
-                    
-                header = data.get("header", {})
-                body = data.get("body", {})
-                
-                if not body:
-                    if header:
-                        tr_cd = header.get('tr_cd', '')
-                        tr_key = header.get('tr_key', '')
-                        rsp_msg = header.get('rsp_msg', '')
-                        tr_type = header.get('tr_type', '')
-                        
-                        # 종목 정보 가져오기
-                        stock_info = self.stock_info.get(tr_key, {})
-                        stock_name = stock_info.get('name', '알 수 없음')
-                        
-                        # 구독/구독해지 상태 확인
-                        status = "구독" if tr_type == "3" else "구독해지" if tr_type == "4" else ""
-                        
-                        if tr_cd and tr_key and status:
-                            self.log_and_print(f">>> {stock_name}({tr_key}) {status} - {rsp_msg}")
-                        else:
-                            self.log_and_print(rsp_msg)
-                    return
-                    
-                # VI 메시지인지 확인
-                if header.get("tr_cd") == "VI_":
-                    self.event_handler.handle_vi_event(data)
-                # KOSPI 체결 정보 메시지인지 확인
-                elif header.get("tr_cd") == "S3_":
-                    self.event_handler.handle_trade_data(data, "S3_")
-                # KOSDAQ 체결 정보 메시지인지 확인
-                elif header.get("tr_cd") == "K3_":
-                    self.event_handler.handle_trade_data(data, "K3_")
-                
-            except json.JSONDecodeError as e:
-                self.log_and_print(f"JSON 파싱 오류: {e}")
-                self.log_and_print(f"원본 메시지: {message}")
-            except Exception as e:
-                self.log_and_print(f"메시지 처리 중 오류 발생: {e}")
-        
-        def on_error(ws, error):
-            self.log_and_print(f"웹소켓 에러 발생: {error}")
-            if hasattr(error, 'status_code'):
-                self.log_and_print(f"상태 코드: {error.status_code}")
-            if hasattr(error, 'reason'):
-                self.log_and_print(f"사유: {error.reason}")
-        
-        def on_close(ws, close_status_code, close_msg):
-            self.log_and_print(f"웹소켓 연결이 종료되었습니다. (상태 코드: {close_status_code}, 메시지: {close_msg})")
-            if self.is_running:
-                self.reconnect_count += 1
-                if self.reconnect_count <= self.max_reconnect_attempts:
-                    self.log_and_print(f"{self.reconnect_delay}초 후 재연결을 시도합니다... (시도 {self.reconnect_count}/{self.max_reconnect_attempts})")
-                    asyncio.get_event_loop().call_later(self.reconnect_delay, self.reconnect_websocket)
-                else:
-                    self.log_and_print("최대 재연결 시도 횟수를 초과했습니다. 프로그램을 종료합니다.")
-                    self.cleanup()
-        
-        def on_open(ws):
-            self.log_and_print("웹소켓 연결이 성공했습니다.")
+        async with websockets.connect(
+            self.ws_url,
+            extra_headers=websocket_headers,
+            ping_interval=20,
+            ping_timeout=10
+        ) as ws:
+            self.ws = ws
+            self.log("웹소켓 연결이 성공했습니다.")
             self.reconnect_count = 0  # 재연결 성공 시 카운트 초기화
             
-            # VI 모니터링 구독 요청
-            subscribe_message = {
-                "header": {
-                    "token": self.token,
-                    "tr_type": "3"  # 실시간 시세 등록
-                },
-                "body": {
-                    "tr_cd": "VI_",
-                    "tr_key": "000000"  # 전체 종목
-                }
-            }
+            # VI 모니터링 구독 요청 (토큰만 바뀌므로 템플릿에 채워 전송)
+            subscribe_message = VI_SUBSCRIBE_TEMPLATE % self.token
             
-            self.log_and_print("VI 모니터링 구독 요청 전송:")
-            self.log_and_print(json.dumps(subscribe_message, indent=2))
+            self.log("VI 모니터링 구독 요청 전송")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(json.dumps(orjson.loads(subscribe_message), indent=2))
             
-            ws.send(json.dumps(subscribe_message))
-            self.log_and_print("VI 모니터링 시작...")
-        
-        # 웹소켓 객체 생성
-        return websocket.WebSocketApp(
-            self.ws_url,
-            header=websocket_headers,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close,
-            on_open=on_open
-        )
-
-    def reconnect_websocket(self):
-        """웹소켓 재연결"""
-        if not self.is_running or self.is_reconnecting:
-            return
+            await ws.send(subscribe_message)
+            self.log("VI 모니터링 시작...")
             
+            # VI 이벤트 핸들러의 웹소켓 객체 업데이트 (재연결 시 기존 종목 재구독)
+            if not await self.event_handler.update_websocket(ws):
+                raise Exception("VI 이벤트 핸들러 업데이트 실패")
+            
+            async for message in ws:
+                await self._dispatch(message)
+    
+    async def _dispatch(self, message):
+        """수신 메시지 처리"""
         try:
-            self.is_reconnecting = True
-            self.log_and_print("웹소켓 재연결 시도 중...")
+            # 종목코드가 없는 프레임(구독 응답 등)은 전체 파싱 없이 응답 처리로 넘김
+            if isinstance(message, (bytes, bytearray)):
+                is_ack = b'"shcode"' not in message and b'"ref_shcode"' not in message
+            else:
+                is_ack = '"shcode"' not in message and '"ref_shcode"' not in message
+            if is_ack:
+                self._handle_ack(message)
+                return
+
+            data = orjson.loads(message)
+            self.logger.debug("메시지 수신: %s", message)
             
-            # 기존 웹소켓 연결 종료
-            if self.ws:
-                try:
-                    self.ws.close()
-                except:
-                    pass
-                self.ws = None
+            # 헤더와 바디가 있는지 확인
+            if not isinstance(data, dict):
+                self.log("잘못된 메시지 형식입니다.")
+                return
+                
+            header = data.get("header", {})
             
-            # 새로운 웹소켓 객체 생성
-            self.ws = asyncio.get_event_loop().run_until_complete(self.create_websocket())
+            # tr_cd별 처리 메서드 호출
+            handler = self._tr_handlers.get(header.get("tr_cd"))
+            if handler:
+                await handler(data)
             
-            if self.ws:
-                # VI 이벤트 핸들러의 웹소켓 객체 업데이트
-                if self.event_handler and self.event_handler.update_websocket(self.ws):
-                    self.log_and_print("웹소켓 재연결 성공")
-                    self.reconnect_count = 0  # 성공 시 카운트 초기화
-                else:
-                    raise Exception("VI 이벤트 핸들러 업데이트 실패")
-                
-                # 웹소켓 실행
-                self.ws.run_forever()
-            else:
-                raise Exception("웹소켓 객체 생성 실패")
-                
+        except orjson.JSONDecodeError as e:
+            self.log(f"JSON 파싱 오류: {e}")
+            self.log(f"원본 메시지: {message}")
         except Exception as e:
-            self.log_and_print(f"웹소켓 재연결 중 오류 발생: {e}", level='error')
-            self.ws = None
-            
-            # 재연결 실패 시 재시도
-            self.reconnect_count += 1
-            if self.reconnect_count <= self.max_reconnect_attempts:
-                self.log_and_print(f"{self.reconnect_delay}초 후 재연결을 다시 시도합니다... (시도 {self.reconnect_count}/{self.max_reconnect_attempts})")
-                asyncio.get_event_loop().call_later(self.reconnect_delay, self.reconnect_websocket)
-            else:
-                self.log_and_print("최대 재연결 시도 횟수를 초과했습니다. 프로그램을 종료합니다.")
-                self.cleanup()
-        finally:
-            self.is_reconnecting = False
+            self.log(f"메시지 처리 중 오류 발생: {e}")
+
+    def _handle_ack(self, message):
+        """구독/구독해지 응답 등 바디가 없는 메시지 처리"""
+        try:
+            data = orjson.loads(message)
+        except orjson.JSONDecodeError as e:
+            self.log(f"JSON 파싱 오류: {e}")
+            self.log(f"원본 메시지: {message}")
+            return
+        self.logger.debug("메시지 수신: %s", message)
+        
+        header = data.get("header") if isinstance(data, dict) else None
+        if not header:
+            return
+        
+        tr_cd = header.get('tr_cd', '')
+        tr_key = header.get('tr_key', '')
+        rsp_msg = header.get('rsp_msg', '')
+        tr_type = header.get('tr_type', '')
+        
+        # 종목 정보 가져오기
+        stock_name = self.stock_info.get(tr_key, UNKNOWN_STOCK).name
+        
+        # 구독/구독해지 상태 확인
+        status = "구독" if tr_type == "3" else "구독해지" if tr_type == "4" else ""
+        
+        if tr_cd and tr_key and status:
+            self.log(f">>> {stock_name}({tr_key}) {status} - {rsp_msg}")
+        else:
+            self.log(rsp_msg)
 
     async def create_test_vi_event(self):
         """테스트용 VI 이벤트 생성"""
@@ -652,12 +681,12 @@ class VIMonitor:
             }
         }
         
-        self.log_and_print("\n테스트 VI 발동 이벤트 발생:")
-        self.log_and_print(json.dumps(test_vi_data_on, indent=2))
+        self.log("\n테스트 VI 발동 이벤트 발생:")
+        self.log(json.dumps(test_vi_data_on, indent=2))
         
         # VI 이벤트 핸들러에 전달
         if self.event_handler:
-            self.event_handler.handle_vi_event(test_vi_data_on)
+            await self.event_handler.handle_vi_event(test_vi_data_on)
             
             # 10초 후 VI 해제 이벤트 발생
             await asyncio.sleep(100)
@@ -679,53 +708,80 @@ class VIMonitor:
                 }
             }
             
-            self.log_and_print("\n테스트 VI 해제 이벤트 발생:")
-            self.log_and_print(json.dumps(test_vi_data_off, indent=2))
-            self.event_handler.handle_vi_event(test_vi_data_off)
+            self.log("\n테스트 VI 해제 이벤트 발생:")
+            self.log(json.dumps(test_vi_data_off, indent=2))
+            await self.event_handler.handle_vi_event(test_vi_data_off)
         else:
-            self.log_and_print("VI 이벤트 핸들러가 초기화되지 않았습니다.", level='error')
+            self.log_err("VI 이벤트 핸들러가 초기화되지 않았습니다.")
 
     async def monitor_vi_status(self):
         """VI 상태 모니터링"""
         if not self.token:
-            self.log_and_print("토큰이 없습니다. 먼저 토큰을 발급받아주세요.")
+            self.log("토큰이 없습니다. 먼저 토큰을 발급받아주세요.")
             return
             
-        self.log_and_print("\n웹소켓 연결 시도...")
-        self.log_and_print(f"URL: {self.ws_url}")
+        self.log("\n웹소켓 연결 시도...")
+        self.log(f"URL: {self.ws_url}")
+        
+        # VI 이벤트 핸들러 초기화 (웹소켓은 연결될 때마다 갱신)
+        self.event_handler = VIEventHandler(self.token, None, self.kst, self.stock_info)
+        
+        # tr_cd별 메시지 처리 메서드 (VI는 코루틴, 체결은 일반 함수)
+        self._tr_handlers = {
+            "VI_": self.event_handler.handle_vi_event,
+            "S3_": partial(self.event_handler.handle_trade_data, market_type="S3_"),  # KOSPI 체결
+            "K3_": partial(self.event_handler.handle_trade_data, market_type="K3_"),  # KOSDAQ 체결
+        }
+        
+        # 테스트 VI 이벤트 생성 태스크 시작
+        test_task = asyncio.create_task(self.create_test_vi_event())
         
         try:
-            # 웹소켓 연결
-            self.ws = await self.create_websocket()
-            
-            # VI 이벤트 핸들러 초기화 (웹소켓 연결 후에 초기화)
-            self.event_handler = VIEventHandler(self.token, self.ws, self.kst, self.stock_info)
-            self.event_handler.event_loop = asyncio.get_event_loop()
-            
-            # 테스트 VI 이벤트 생성 태스크 시작
-            asyncio.create_task(self.create_test_vi_event())
-            
-            # 웹소켓 실행
-            self.ws.run_forever()
-            
-        except Exception as e:
-            self.log_and_print(f"웹소켓 연결 실패: {str(e)}")
-            raise
+            while self.is_running:
+                try:
+                    await self.create_websocket()
+                    self.log("웹소켓 연결이 종료되었습니다.")
+                except websockets.exceptions.ConnectionClosed as e:
+                    self.log(f"웹소켓 연결이 종료되었습니다. (상태 코드: {e.code}, 메시지: {e.reason})")
+                except Exception as e:
+                    self.log(f"웹소켓 연결 실패: {str(e)}")
+                finally:
+                    self.ws = None
+                
+                if not self.is_running:
+                    break
+                
+                # 지수 백오프로 재연결 대기
+                self.reconnect_count += 1
+                if self.reconnect_count > self.max_reconnect_attempts:
+                    self.log("최대 재연결 시도 횟수를 초과했습니다. 프로그램을 종료합니다.")
+                    await self.cleanup()
+                    break
+                delay = min(self.max_reconnect_delay, self.reconnect_delay * 2 ** (self.reconnect_count - 1))
+                self.log(f"{delay}초 후 재연결을 시도합니다... (시도 {self.reconnect_count}/{self.max_reconnect_attempts})")
+                await asyncio.sleep(delay)
+        finally:
+            test_task.cancel()
 
-    def cleanup(self):
+    async def cleanup(self):
         """프로그램 종료 시 정리 작업"""
-        self.log_and_print("프로그램 종료 중...")
+        self.log("프로그램 종료 중...")
         self.is_running = False
         
         # VI 이벤트 핸들러 정리
         if self.event_handler:
-            self.event_handler.cleanup()
+            await self.event_handler.cleanup()
         
         # 웹소켓 연결 종료
         if self.ws:
-            self.ws.close()
+            await self.ws.close()
+        
+        self.log("프로그램이 종료되었습니다.")
         
-        self.log_and_print("프로그램이 종료되었습니다.")
+        # 큐에 남은 로그를 모두 기록한 뒤 리스너 종료 (중복 호출 방지)
+        if self.log_listener:
+            self.log_listener.stop()
+            self.log_listener = None
 
 async def main():
     monitor = VIMonitor()
@@ -735,10 +791,10 @@ async def main():
         await monitor.monitor_vi_status()
     except KeyboardInterrupt:
         print("키보드 인터럽트가 감지되었습니다.")
-        monitor.cleanup()
+        await monitor.cleanup()
     except Exception as e:
         print(f"예상치 못한 오류가 발생했습니다: {e}")
-        monitor.cleanup()
+        await monitor.cleanup()
 
 if __name__ == "__main__":
     try:
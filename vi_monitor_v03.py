@@ -1,24 +1,73 @@
 import os
+import sys
 import json
+import time
+import heapq
+import bisect
 import asyncio
 import websockets
 from datetime import datetime, timedelta
 import pytz
 from dotenv import load_dotenv, set_key
 import csv
+import pickle
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from abc import ABC, abstractmethod
-from functools import lru_cache
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple, Callable, Awaitable, Deque
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
+from operator import itemgetter
 import aiohttp
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        """orjson 직렬화 결과를 텍스트 프레임으로 보내기 위해 문자열로 변환"""
+        return orjson.dumps(obj).decode()
+
+    def _json_pretty(obj: Any) -> str:
+        """디버그 로그용 들여쓰기 직렬화"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:  # orjson 미설치 환경에서는 표준 json 사용
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+    def _json_pretty(obj: Any) -> str:
+        """디버그 로그용 들여쓰기 직렬화"""
+        return json.dumps(obj, indent=2)
+
+# uvloop 사용 가능 시 기본 이벤트 루프로 설정 (Windows 등 미지원 환경은 기본 루프 사용)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # 환경 변수 로드
 load_dotenv()
 
-@dataclass
+# 체결 정보 구독/해지 메시지 형식 (token, tr_type, tr_cd를 채운 뒤 종목코드만 치환)
+_MESSAGE_FORMAT = '{"header":{"token":"%s","tr_type":"%s"},"body":{"tr_cd":"%s","tr_key":"%%s"}}'
+
+# log() 레벨 이름별 logging 레벨
+_LOG_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR
+}
+
+# 한국 표준시의 UTC 오프셋 (초, 서머타임 없음)
+_KST_OFFSET = 9 * 3600
+
+# 시장 구분별 체결 tr_cd (KOSPI: S3_, KOSDAQ: K3_)
+_MARKET_TR_CD = {sys.intern("KOSPI"): "S3_", sys.intern("KOSDAQ"): "K3_"}
+
+@dataclass(slots=True, frozen=True)
 class StockInfo:
     """종목 정보를 저장하는 데이터 클래스"""
     name: str
@@ -32,6 +81,7 @@ class StockInfo:
 class BaseHandler(ABC):
     """기본 핸들러 클래스"""
     _logger = None  # 클래스 변수로 로거 객체 저장
+    _log_listener: Optional[QueueListener] = None  # 파일/콘솔 출력을 담당하는 로그 리스너
     
     def __init__(self, logger_name: str):
         self.kst = pytz.timezone('Asia/Seoul')
@@ -64,16 +114,24 @@ class BaseHandler(ABC):
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
         
-        # 핸들러 추가
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # 파일/콘솔 출력은 리스너 스레드에서 처리하고 로거는 큐에 넣기만 함
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        BaseHandler._log_listener = QueueListener(log_queue, file_handler, console_handler)
+        BaseHandler._log_listener.start()
         
         return logger
     
+    @classmethod
+    def stop_logging(cls) -> None:
+        """큐에 남은 로그를 모두 기록한 뒤 로그 리스너 종료"""
+        if cls._log_listener is not None:
+            cls._log_listener.stop()
+            cls._log_listener = None
+    
     def log(self, message: str, level: str = 'info') -> None:
-        """통합 로깅 메서드"""
-        log_message = f"[{self.logger_name}] {message}"
-        getattr(self.logger, level)(log_message)
+        """통합 로깅 메서드 (출력되지 않는 레벨이면 접두어 포맷팅 생략)"""
+        self.logger.log(_LOG_LEVELS.get(level, logging.INFO), "[%s] %s", self.logger_name, message)
 
 class DataManager(BaseHandler):
     """데이터 관리 클래스"""
@@ -82,11 +140,13 @@ class DataManager(BaseHandler):
         self.stock_info: Dict[str, StockInfo] = {}
         self.vi_active_stocks: Dict[str, datetime] = {}
         self.unsubscribed_stocks: Dict[str, Dict[str, Any]] = {}
-        self._vi_timers: Dict[str, asyncio.Task] = {}  # VI 타이머 태스크 저장
+        self._timer_heap: List[Tuple[float, str]] = []  # (만료 monotonic 시각, 종목코드) 힙
+        self._timer_entries: Dict[str, Tuple[float, Callable[[str], Awaitable[None]]]] = {}  # 종목별 유효한 만료 시각과 콜백
+        self._timer_wake = asyncio.Event()  # 타이머 힙 변경 알림
+        self._timer_task: Optional[asyncio.Task] = None  # 모든 VI 타이머를 처리하는 단일 태스크
     
-    @lru_cache(maxsize=1000)
     def get_stock_info(self, stock_code: str) -> Optional[StockInfo]:
-        """종목 정보 조회 (캐시 적용)"""
+        """종목 정보 조회"""
         return self.stock_info.get(stock_code)
     
     def add_vi_stock(self, stock_code: str) -> None:
@@ -107,10 +167,8 @@ class DataManager(BaseHandler):
             }
             self.log(f"VI 발동 종목 제거: {stock_code} (해제시각: {deactivation_time.strftime('%H:%M:%S')})")
             
-            # 타이머 취소
-            if stock_code in self._vi_timers:
-                self._vi_timers[stock_code].cancel()
-                del self._vi_timers[stock_code]
+            # 타이머 취소 (힙에 남은 항목은 타이머 태스크가 꺼낼 때 건너뜀)
+            self._timer_entries.pop(stock_code, None)
     
     def is_vi_active(self, stock_code: str) -> bool:
         """VI 발동 상태 확인"""
@@ -120,28 +178,57 @@ class DataManager(BaseHandler):
         """현재 활성화된 VI 종목 목록 반환"""
         return list(self.vi_active_stocks.keys())
     
-    async def start_vi_timer(self, stock_code: str, callback) -> None:
-        """VI 타이머 시작"""
-        if stock_code in self._vi_timers:
-            self._vi_timers[stock_code].cancel()
-        
-        # 3분 타이머 시작
-        timer = asyncio.create_task(self._vi_timer(stock_code, callback))
-        self._vi_timers[stock_code] = timer
+    async def start_vi_timer(self, stock_code: str, callback: Callable[[str], Awaitable[None]]) -> None:
+        """VI 타이머 시작 (3분 후 콜백 실행)"""
+        deadline = time.monotonic() + 180  # 3분 후
+        self._timer_entries[stock_code] = (deadline, callback)
+        heapq.heappush(self._timer_heap, (deadline, stock_code))
+        
+        if self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.create_task(self._run_vi_timers())
+        else:
+            self._timer_wake.set()
     
-    async def _vi_timer(self, stock_code: str, callback) -> None:
-        """VI 타이머 실행"""
-        try:
-            await asyncio.sleep(180)  # 3분 대기
-            if stock_code in self.vi_active_stocks:
-                await callback(stock_code)
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            self.log(f"VI 타이머 실행 중 오류 발생: {e}", 'error')
-        finally:
-            if stock_code in self._vi_timers:
-                del self._vi_timers[stock_code]
+    async def _run_vi_timers(self) -> None:
+        """가장 먼저 만료되는 VI 타이머까지 대기한 뒤 콜백 실행"""
+        heap = self._timer_heap
+        while True:
+            if not heap:
+                await self._timer_wake.wait()
+                self._timer_wake.clear()
+                continue
+            
+            deadline, stock_code = heap[0]
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                # 새 타이머가 추가되면 깨어나서 힙의 맨 앞을 다시 확인
+                self._timer_wake.clear()
+                try:
+                    await asyncio.wait_for(self._timer_wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(heap)
+            entry = self._timer_entries.get(stock_code)
+            # 취소되었거나 다시 시작된 타이머는 건너뜀
+            if entry is None or entry[0] != deadline:
+                continue
+            del self._timer_entries[stock_code]
+            
+            try:
+                if stock_code in self.vi_active_stocks:
+                    await entry[1](stock_code)
+            except Exception as e:
+                self.log(f"VI 타이머 실행 중 오류 발생: {e}", 'error')
+    
+    def cleanup(self) -> None:
+        """정리 작업 (대기 중인 VI 타이머 태스크 취소)"""
+        if self._timer_task:
+            self._timer_task.cancel()
+            self._timer_task = None
+        self._timer_heap.clear()
+        self._timer_entries.clear()
 
 class WebSocketManager(BaseHandler):
     """웹소켓 관리 클래스"""
@@ -150,7 +237,8 @@ class WebSocketManager(BaseHandler):
         self.url = url
         self.token = token
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        self._buf: Deque[Any] = deque()  # 수신 메시지 버퍼 (소비자는 하나)
+        self._waiter: Optional[asyncio.Future] = None  # 메시지를 기다리는 소비자 깨우기용
         self.is_running = True
         self.reconnect_delay = 5
         self.max_reconnect_attempts = 5
@@ -159,7 +247,8 @@ class WebSocketManager(BaseHandler):
     async def connect(self) -> None:
         """웹소켓 연결"""
         try:
-            async with websockets.connect(self.url) as ws:
+            # 압축 확장을 쓰지 않아 수신 프레임마다 압축 해제하지 않음
+            async with websockets.connect(self.url, compression=None) as ws:
                 self.ws = ws
                 self.log("웹소켓을 성공적으로 연결했습니다.")
                 await self._handle_connection()
@@ -172,7 +261,10 @@ class WebSocketManager(BaseHandler):
         try:
             while self.is_running and self.ws:
                 message = await self.ws.recv()
-                await self.event_queue.put(message)
+                self._buf.append(message)
+                waiter = self._waiter
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(None)
         except websockets.exceptions.ConnectionClosed:
             self.log("웹소켓 연결이 종료되었습니다.")
             await self._handle_reconnection()
@@ -180,6 +272,16 @@ class WebSocketManager(BaseHandler):
             self.log(f"웹소켓 처리 중 오류 발생: {e}", 'error')
             await self._handle_reconnection()
     
+    async def get_message(self) -> Any:
+        """수신 메시지 꺼내기 (버퍼가 비어 있으면 다음 메시지까지 대기)"""
+        while not self._buf:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._buf.popleft()
+    
     async def _handle_reconnection(self) -> None:
         """재연결 처리"""
         if not self.is_running:
@@ -198,7 +300,16 @@ class WebSocketManager(BaseHandler):
         """메시지 전송"""
         if self.ws:
             try:
-                await self.ws.send(json.dumps(message))
+                await self.ws.send(_json_dumps(message))
+            except Exception as e:
+                self.log(f"메시지 전송 중 오류 발생: {e}", 'error')
+                await self._handle_reconnection()
+    
+    async def send_raw(self, message: str) -> None:
+        """직렬화된 메시지 전송"""
+        if self.ws:
+            try:
+                await self.ws.send(message)
             except Exception as e:
                 self.log(f"메시지 전송 중 오류 발생: {e}", 'error')
                 await self._handle_reconnection()
@@ -216,10 +327,29 @@ class MessageProcessor(BaseHandler):
         self.data_manager = data_manager
         self.ws_manager = ws_manager
         
+        # 메시지마다 호출되는 메서드는 미리 바인딩해 속성 조회 생략
+        self._is_vi_active = data_manager.is_vi_active
+        self._get_stock_info = data_manager.get_stock_info
+        self._is_enabled_for = self.logger.isEnabledFor
+        
+        # (시장 구분, tr_type)별 직렬화된 구독/해지 메시지 템플릿
+        self._msg_templates: Dict[Tuple[str, str], str] = {
+            (market, tr_type): _MESSAGE_FORMAT % (ws_manager.token, tr_type, tr_cd)
+            for market, tr_cd in _MARKET_TR_CD.items()
+            for tr_type in ("3", "4")
+        }
+        
+        # tr_cd별 메시지 처리 메서드
+        self._handlers = {
+            "VI_": self._process_vi_message,
+            "S3_": self._process_trade_message,
+            "K3_": self._process_trade_message,
+        }
+        
     async def process_message(self, message: str) -> None:
         """메시지 처리"""
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             if not isinstance(data, dict):
                 self.log("잘못된 메시지 형식입니다.")
                 return
@@ -231,11 +361,9 @@ class MessageProcessor(BaseHandler):
                 self._process_system_message(header)
                 return
             
-            tr_cd = header.get("tr_cd")
-            if tr_cd == "VI_":
-                await self._process_vi_message(data)
-            elif tr_cd in ["S3_", "K3_"]:
-                await self._process_trade_message(data)
+            handler = self._handlers.get(header.get("tr_cd"))
+            if handler:
+                await handler(data)
                 
         except json.JSONDecodeError as e:
             self.log(f"JSON 파싱 오류: {e}", 'error')
@@ -266,12 +394,12 @@ class MessageProcessor(BaseHandler):
         if not stock_code:
             return
             
-        stock_info = self.data_manager.get_stock_info(stock_code)
+        stock_info = self._get_stock_info(stock_code)
         if not stock_info:
             return
             
         # VI 발동 처리
-        if vi_gubun in ["1", "2", "3"] and not self.data_manager.is_vi_active(stock_code):
+        if vi_gubun in ["1", "2", "3"] and not self._is_vi_active(stock_code):
             self.data_manager.add_vi_stock(stock_code)
             await self._subscribe_trade_data(stock_code, stock_info.market)
             
@@ -286,47 +414,36 @@ class MessageProcessor(BaseHandler):
         body = data.get("body", {})
         stock_code = body.get("shcode")
         
-        if not stock_code or not self.data_manager.is_vi_active(stock_code):
+        if not stock_code or not self._is_vi_active(stock_code):
+            return
+        
+        # 체결 정보는 출력만 하므로 INFO 로그가 꺼져 있으면 시각 계산과 포맷팅 생략
+        if not self._is_enabled_for(logging.INFO):
             return
             
-        stock_info = self.data_manager.get_stock_info(stock_code)
+        stock_info = self._get_stock_info(stock_code)
         if not stock_info:
             return
             
         # 체결 정보 출력
-        current_time = datetime.now(self.kst)
-        self.log(f"[{current_time.strftime('%H:%M:%S')}] 체결 | {stock_info.name}({stock_code}) | "
-                f"{body.get('price'):>7}원 | {body.get('cvolume'):>6}주")
+        # 체결 시각 표시는 시:분:초만 필요하므로 datetime 대신 epoch에 KST 오프셋만 더해 포맷
+        timestamp = time.strftime('%H:%M:%S', time.gmtime(time.time() + _KST_OFFSET))
+        self.logger.info("[%s] [%s] 체결 | %s(%s) | %7s원 | %6s주",
+                         self.logger_name, timestamp, stock_info.name, stock_code,
+                         body.get('price'), body.get('cvolume'))
+    
+    def _build_message(self, market: str, tr_type: str, stock_code: str) -> str:
+        """구독/해지 메시지 생성 (직렬화된 템플릿에 종목코드만 치환)"""
+        template = self._msg_templates.get((market, tr_type)) or self._msg_templates[("KOSDAQ", tr_type)]
+        return template % stock_code
     
     async def _subscribe_trade_data(self, stock_code: str, market: str) -> None:
         """체결 정보 구독"""
-        tr_cd = "S3_" if market == "KOSPI" else "K3_"
-        message = {
-            "header": {
-                "token": self.ws_manager.token,
-                "tr_type": "3"
-            },
-            "body": {
-                "tr_cd": tr_cd,
-                "tr_key": stock_code
-            }
-        }
-        await self.ws_manager.send(message)
+        await self.ws_manager.send_raw(self._build_message(market, "3", stock_code))
         
     async def _unsubscribe_trade_data(self, stock_code: str, market: str) -> None:
         """체결 정보 구독 해제"""
-        tr_cd = "S3_" if market == "KOSPI" else "K3_"
-        message = {
-            "header": {
-                "token": self.ws_manager.token,
-                "tr_type": "4"
-            },
-            "body": {
-                "tr_cd": tr_cd,
-                "tr_key": stock_code
-            }
-        }
-        await self.ws_manager.send(message)
+        await self.ws_manager.send_raw(self._build_message(market, "4", stock_code))
 
 class TokenManager(BaseHandler):
     """토큰 관리 클래스"""
@@ -338,6 +455,7 @@ class TokenManager(BaseHandler):
         self.token = None
         self.token_expires_at = None
         self.kst = kst
+        self.http_session: Optional[aiohttp.ClientSession] = None  # VIMonitor와 공유하는 HTTP 세션
     
     def save_token_to_env(self, token, expires_in):
         """토큰 정보를 .env 파일에 저장"""
@@ -402,30 +520,37 @@ class TokenManager(BaseHandler):
         
         self.log("\n토큰 발급 요청 정보:")
         self.log(f"URL: {self.token_url}")
-        self.log(f"Headers: {headers}")
-        self.log(f"Data: {data}")
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            self.log(f"Headers: {headers}", 'debug')
+            self.log(f"Data: {data}", 'debug')
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(self.token_url, headers=headers, data=data) as response:
-                    self.log(f"\n응답 상태 코드: {response.status}")
-                    result = await response.json()
-                    self.log(f"응답 데이터: {json.dumps(result, indent=2)}")
+        # 공유 세션이 주어지지 않은 경우에만 임시 세션 생성
+        session = self.http_session or aiohttp.ClientSession()
+        try:
+            async with session.post(self.token_url, headers=headers, data=data) as response:
+                self.log(f"\n응답 상태 코드: {response.status}")
+                result = await response.json()
+                if debug_enabled:
+                    self.log(f"응답 데이터: {_json_pretty(result)}", 'debug')
+                
+                if response.status == 200:
+                    token = result.get("access_token")
+                    expires_in = result.get("expires_in")
+                    self.save_token_to_env(token, expires_in)
+                    return token
+                else:
+                    error_msg = f"\n토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}"
+                    self.log(error_msg, 'error')
+                    raise Exception(error_msg)
                     
-                    if response.status == 200:
-                        token = result.get("access_token")
-                        expires_in = result.get("expires_in")
-                        self.save_token_to_env(token, expires_in)
-                        return token
-                    else:
-                        error_msg = f"\n토큰 발급 실패: {result.get('error_description', '알 수 없는 오류')}"
-                        self.log(error_msg, 'error')
-                        raise Exception(error_msg)
-                        
-            except Exception as e:
-                error_msg = f"\n토큰 발급 중 오류 발생: {str(e)}"
-                self.log(error_msg, 'error')
-                raise
+        except Exception as e:
+            error_msg = f"\n토큰 발급 중 오류 발생: {str(e)}"
+            self.log(error_msg, 'error')
+            raise
+        finally:
+            if session is not self.http_session:
+                await session.close()
 
 class VIEventHandler(BaseHandler):
     """VI 이벤트 처리 및 체결 구독 관리 클래스"""
@@ -436,14 +561,13 @@ class VIEventHandler(BaseHandler):
         self.kst = kst
         self.stock_info = stock_info
         self.vi_active_stocks = {}  # VI 발동된 종목 코드와 발동 시각 저장
+        self._active_sorted = []  # 정렬된 구독 종목 코드 (추가/삭제 시 정렬 유지)
+        self._active_display = ''  # 로그 출력용 구독 종목 목록 문자열
         self.unsubscribed_stocks = {}  # 해지 완료된 종목 정보 저장
         self.event_loop = None  # 이벤트 루프 저장
+        self.timer_tasks = set()  # 3분 구독 해제 타이머 태스크 (참조 유지)
         self.is_reconnecting = False  # 재연결 중 여부
     
-    def get_tr_cd(self, market_type):
-        """시장 구분을 tr_cd로 변환"""
-        return "S3_" if market_type == "KOSPI" else "K3_" if market_type == "KOSDAQ" else market_type
-
     def handle_vi_event(self, vi_data):
         """VI 이벤트 처리"""
         body = vi_data.get("body", {})
@@ -461,7 +585,7 @@ class VIEventHandler(BaseHandler):
         stock_code = body.get('ref_shcode')
         stock_info = self.stock_info.get(stock_code, {})
         market_type = stock_info.get('market', 'KOSPI')
-        tr_cd = self.get_tr_cd(market_type)
+        tr_cd = _MARKET_TR_CD.get(market_type, market_type)
         stock_name = stock_info.get('name', '알 수 없음')
         
         # VI 상태 정보를 한 줄로 출력
@@ -471,18 +595,28 @@ class VIEventHandler(BaseHandler):
         # VI 발동된 경우 체결 정보 구독
         if vi_gubun in ["1", "2", "3"] and stock_code not in self.vi_active_stocks:
             self.vi_active_stocks[stock_code] = current_time
+            bisect.insort(self._active_sorted, stock_code)
+            self._active_display = ', '.join(self._active_sorted)
             self.subscribe_trade_data(stock_code, tr_cd)
             sub_message = f">>> {market_type} {stock_name}({stock_code}) 종목 체결 정보 구독 시작"
             self.log(sub_message)
             
             # 3분 후 자동 구독 취소를 위한 타이머 시작
-            if self.event_loop:
-                asyncio.run_coroutine_threadsafe(
-                    self.delayed_unsubscribe_after_3min(stock_code, market_type, stock_name),
-                    self.event_loop
-                )
+            # (이벤트 루프 안에서 호출되면 바로 태스크 생성, 다른 스레드에서만 스레드 안전 예약)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                if self.event_loop:
+                    asyncio.run_coroutine_threadsafe(
+                        self.delayed_unsubscribe_after_3min(stock_code, market_type, stock_name),
+                        self.event_loop
+                    )
+                else:
+                    self.log("이벤트 루프가 설정되지 않았습니다.", 'error')
             else:
-                self.log("이벤트 루프가 설정되지 않았습니다.", 'error')
+                task = asyncio.create_task(self.delayed_unsubscribe_after_3min(stock_code, market_type, stock_name))
+                self.timer_tasks.add(task)
+                task.add_done_callback(self.timer_tasks.discard)
 
     def handle_trade_data(self, trade_data, market_type):
         """체결 데이터 처리"""
@@ -519,7 +653,9 @@ class VIEventHandler(BaseHandler):
                 
                 # 활성 목록에서 제거
                 del self.vi_active_stocks[stock_code]
-                tr_cd = self.get_tr_cd(market_type)
+                self._active_sorted.remove(stock_code)
+                self._active_display = ', '.join(self._active_sorted)
+                tr_cd = _MARKET_TR_CD.get(market_type, market_type)
                 self.unsubscribe_trade_data(stock_code, tr_cd)
                 
                 unsub_message = f">>> {market_type} {stock_name}({stock_code}) 종목 체결 정보 구독 해제 (3분 경과)"
@@ -543,7 +679,7 @@ class VIEventHandler(BaseHandler):
             for stock_code in list(self.vi_active_stocks.keys()):
                 stock_info = self.stock_info.get(stock_code, {})
                 market_type = stock_info.get('market', 'KOSPI')
-                tr_cd = self.get_tr_cd(market_type)
+                tr_cd = _MARKET_TR_CD.get(market_type, market_type)
                 self.subscribe_trade_data(stock_code, tr_cd)
                 
             self.is_reconnecting = False
@@ -571,9 +707,9 @@ class VIEventHandler(BaseHandler):
                 }
             }
             
-            self.ws.send(json.dumps(subscribe_message))
+            self.ws.send(_json_dumps(subscribe_message))
             if not self.is_reconnecting:
-                self.log(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({', '.join(sorted(self.vi_active_stocks))})")
+                self.log(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({self._active_display})")
         except Exception as e:
             self.log(f"구독 요청 중 오류 발생: {e}", 'error')
 
@@ -595,9 +731,9 @@ class VIEventHandler(BaseHandler):
                 }
             }
             
-            self.ws.send(json.dumps(unsubscribe_message))
+            self.ws.send(_json_dumps(unsubscribe_message))
             if not self.is_reconnecting:
-                self.log(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({', '.join(sorted(self.vi_active_stocks))})")
+                self.log(f">>> 현재 구독 중인 종목 수: {len(self.vi_active_stocks)}개 ({self._active_display})")
         except Exception as e:
             self.log(f"구독 해제 요청 중 오류 발생: {e}", 'error')
 
@@ -608,7 +744,7 @@ class VIEventHandler(BaseHandler):
         # VI 발동된 모든 종목의 체결 정보 구독 해제
         for stock_code in list(self.vi_active_stocks.keys()):
             market_type = self.stock_info.get(stock_code, {}).get('market', 'KOSPI')
-            tr_cd = self.get_tr_cd(market_type)
+            tr_cd = _MARKET_TR_CD.get(market_type, market_type)
             self.unsubscribe_trade_data(stock_code, tr_cd)
         
         self.log("구독 정리 작업 완료")
@@ -628,11 +764,19 @@ class VIMonitor(BaseHandler):
         self.data_manager = DataManager()
         self.ws_manager = None
         self.message_processor = None
+        self._http: Optional[aiohttp.ClientSession] = None  # 토큰 발급/종목 조회에 공유하는 HTTP 세션
+        
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """공유 HTTP 세션 반환 (없으면 이벤트 루프 안에서 생성)"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300))
+        return self._http
         
     async def initialize(self) -> None:
         """초기화"""
         try:
             # 토큰 발급
+            self.token_manager.http_session = self._get_http_session()
             self.token = await self.token_manager.get_access_token()
             if not self.token:
                 raise Exception("토큰 발급 실패")
@@ -654,21 +798,25 @@ class VIMonitor(BaseHandler):
         """종목 정보 로드"""
         today = datetime.now(self.kst).strftime('%Y%m%d')
         csv_file = f'stocks_info_{today}.csv'
+        pickle_file = f'stocks_info_{today}.pkl'
+        
+        # 오늘 저장한 스냅샷이 있으면 CSV 파싱 없이 한 번에 복원
+        try:
+            stock_info = await asyncio.to_thread(self._read_stock_info_pickle, pickle_file)
+            self.log(f"오늘({today}) 저장된 종목 정보 스냅샷 파일을 불러옵니다.")
+            self.data_manager.stock_info.update(stock_info)
+            return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"종목 정보 스냅샷 파일 로드 실패, CSV 파일을 사용합니다: {e}", 'warning')
         
         if os.path.exists(csv_file):
             self.log(f"오늘({today}) 저장된 종목 정보 파일을 불러옵니다.")
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    self.data_manager.stock_info[row['종목코드']] = StockInfo(
-                        name=row['종목명'],
-                        market=row['시장구분'],
-                        etf=row['ETF구분'] == 'True',
-                        upper_limit=int(row['상한가']),
-                        lower_limit=int(row['하한가']),
-                        prev_close=int(row['전일가']),
-                        base_price=int(row['기준가'])
-                    )
+            # 파일 읽기와 파싱은 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+            stock_info = await asyncio.to_thread(self._read_stock_info_csv, csv_file)
+            self.data_manager.stock_info.update(stock_info)
+            await asyncio.to_thread(self._write_stock_info_pickle, pickle_file, stock_info)
             return
         
         # API로 종목 정보 조회
@@ -688,52 +836,79 @@ class VIMonitor(BaseHandler):
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=headers, json=request_data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        stock_list = result.get("t8430OutBlock", [])
-                        
-                        # 종목 정보 저장
-                        for stock in stock_list:
-                            market = "KOSPI" if stock["gubun"] == "1" else "KOSDAQ"
-                            self.data_manager.stock_info[stock["shcode"]] = StockInfo(
-                                name=stock["hname"],
-                                market=market,
-                                etf=stock["etfgubun"] == "1",
-                                upper_limit=stock["uplmtprice"],
-                                lower_limit=stock["dnlmtprice"],
-                                prev_close=stock["jnilclose"],
-                                base_price=stock["recprice"]
-                            )
-                        
-                        # CSV 파일로 저장
-                        self.save_stock_info_to_csv(csv_file)
-                    else:
-                        raise Exception(f"종목 정보 조회 실패: {response.status}")
-            except Exception as e:
-                self.log(f"종목 정보 조회 중 오류 발생: {e}", 'error')
-                raise
+        session = self._get_http_session()
+        try:
+            async with session.post(url, headers=headers, json=request_data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    stock_list = result.get("t8430OutBlock", [])
+                    
+                    # 종목 정보 저장
+                    for stock in stock_list:
+                        market = "KOSPI" if stock["gubun"] == "1" else "KOSDAQ"
+                        self.data_manager.stock_info[stock["shcode"]] = StockInfo(
+                            name=stock["hname"],
+                            market=market,
+                            etf=stock["etfgubun"] == "1",
+                            upper_limit=stock["uplmtprice"],
+                            lower_limit=stock["dnlmtprice"],
+                            prev_close=stock["jnilclose"],
+                            base_price=stock["recprice"]
+                        )
+                    
+                    # CSV 파일 및 스냅샷 파일로 저장 (파일 쓰기는 별도 스레드에서 실행)
+                    await asyncio.to_thread(self.save_stock_info_to_csv, csv_file)
+                    await asyncio.to_thread(self._write_stock_info_pickle, pickle_file,
+                                            self.data_manager.stock_info)
+                else:
+                    raise Exception(f"종목 정보 조회 실패: {response.status}")
+        except Exception as e:
+            self.log(f"종목 정보 조회 중 오류 발생: {e}", 'error')
+            raise
+    
+    @staticmethod
+    def _read_stock_info_pickle(pickle_file: str) -> Dict[str, StockInfo]:
+        """스냅샷 파일에서 종목 정보 읽기"""
+        with open(pickle_file, 'rb') as f:
+            return pickle.load(f)
+    
+    @staticmethod
+    def _write_stock_info_pickle(pickle_file: str, stock_info: Dict[str, StockInfo]) -> None:
+        """종목 정보를 스냅샷 파일로 저장"""
+        with open(pickle_file, 'wb') as f:
+            pickle.dump(stock_info, f, protocol=5)
+    
+    @staticmethod
+    def _read_stock_info_csv(csv_file: str) -> Dict[str, StockInfo]:
+        """CSV 파일에서 종목 정보 읽기"""
+        stock_info: Dict[str, StockInfo] = {}
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            # 필요한 열을 헤더 위치 기준으로 한 번에 꺼냄
+            pick = itemgetter(*map(header.index, ('종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가')))
+            for code, name, market, etf, upper, lower, prev, base in map(pick, reader):
+                stock_info[code] = StockInfo(
+                    name=name,
+                    market=sys.intern(market),
+                    etf=etf == 'True',
+                    upper_limit=int(upper),
+                    lower_limit=int(lower),
+                    prev_close=int(prev),
+                    base_price=int(base)
+                )
+        return stock_info
     
     def save_stock_info_to_csv(self, csv_file: str) -> None:
         """종목 정보를 CSV 파일로 저장"""
+        rows = [
+            (code, info.name, info.market, info.etf, info.upper_limit, info.lower_limit, info.prev_close, info.base_price)
+            for code, info in self.data_manager.stock_info.items()
+        ]
         with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for code, info in self.data_manager.stock_info.items():
-                writer.writerow({
-                    '종목코드': code,
-                    '종목명': info.name,
-                    '시장구분': info.market,
-                    'ETF구분': info.etf,
-                    '상한가': info.upper_limit,
-                    '하한가': info.lower_limit,
-                    '전일가': info.prev_close,
-                    '기준가': info.base_price
-                })
+            writer = csv.writer(f)
+            writer.writerow(['종목코드', '종목명', '시장구분', 'ETF구분', '상한가', '하한가', '전일가', '기준가'])
+            writer.writerows(rows)
     
     async def start(self) -> None:
         """모니터링 시작"""
@@ -746,7 +921,7 @@ class VIMonitor(BaseHandler):
             # 메시지 처리 루프
             while self.is_running:
                 try:
-                    message = await self.ws_manager.event_queue.get()
+                    message = await self.ws_manager.get_message()
                     await self.message_processor.process_message(message)
                 except asyncio.CancelledError:
                     break
@@ -756,17 +931,24 @@ class VIMonitor(BaseHandler):
         except Exception as e:
             self.log(f"모니터링 중 오류 발생: {e}", 'error')
         finally:
-            self.cleanup()
+            await self.cleanup()
     
-    def cleanup(self) -> None:
+    async def cleanup(self) -> None:
         """정리 작업"""
         self.log("프로그램 종료 중...")
         self.is_running = False
         
+        self.data_manager.cleanup()
+        
         if self.ws_manager:
             self.ws_manager.cleanup()
         
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        
         self.log("프로그램이 종료되었습니다.")
+        BaseHandler.stop_logging()
 
 async def main():
     """메인 함수"""
@@ -775,10 +957,10 @@ async def main():
         await monitor.start()
     except KeyboardInterrupt:
         print("키보드 인터럽트가 감지되었습니다.")
-        monitor.cleanup()
+        await monitor.cleanup()
     except Exception as e:
         print(f"예상치 못한 오류가 발생했습니다: {e}")
-        monitor.cleanup()
+        await monitor.cleanup()
 
 if __name__ == "__main__":
     try: